@@ -0,0 +1,150 @@
+import csv
+import json
+import os
+from argparse import ArgumentParser
+from itertools import islice
+
+from DiceGame import check_name, check_pass
+from Migrations import MigrationRunner
+from Utils import SQLManager
+
+
+class Accounts(object):
+    """
+    Imports and exports the accounts in the Users table as CSV or JSON Lines files, so that many players can be
+    moved between databases at once instead of signing up one at a time. Files are read and written as streams,
+    a batch of rows at a time, so that they never have to fit in memory. An account that is imported with a
+    username that is already registered replaces the password and score of the registered account.
+
+    :argument manager: The SQLManager connected to the database of the players.
+
+    :argument batch_size: The amount of rows that are written in a single transaction, or read from sqlite at
+                          once when exporting.
+    """
+
+    # the columns of every file, in the order that they are written in, and those that every account must have.
+    FIELDS = ["Username", "Password", "Score"]
+    REQUIRED = ["Username", "Password"]
+
+    # sqlite statements of the accounts.
+    UPSERT = "INSERT INTO Users (Username, Password, Score) VALUES (?, ?, ?) " \
+             "ON CONFLICT (Username) DO UPDATE SET Password = excluded.Password, Score = excluded.Score"
+    ROWS = "SELECT Username, Password, Score FROM Users ORDER BY Id"
+
+    # initialises variables as an instance is made.
+    def __init__(self, manager: SQLManager, batch_size: int = 10000):
+        self.manager, self.batch_size = manager, batch_size
+        MigrationRunner(manager).migrate()
+        self.rejected = []  # every account that was not imported as (line, username, problem).
+
+    # returns the format of a file from its extension, unless it is given.
+    @staticmethod
+    def file_format(path: str, file_format: str = None):
+        file_format = (file_format or os.path.splitext(path)[1][1:] or "csv").lower()
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError("The file format should be either 'csv' or 'jsonl'!")
+        return file_format
+
+    # goes through every account in a file as a dictionary, along with its line in the file. A line that cannot be
+    # read as an account is given as the problem with it instead.
+    @classmethod
+    def records(cls, file, file_format: str):
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            missing = [field for field in cls.REQUIRED if field not in (reader.fieldnames or cls.REQUIRED)]
+            if missing:  # every row would be read wrongly without the columns, so none of them are.
+                yield 1, "The header of the file has no {} column!".format(" or ".join(missing))
+                return
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_no, line in enumerate(file, 1):
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    yield line_no, record if isinstance(record, dict) else "The line is not a valid account!"
+
+    # returns a score from a file as an integer, or None if it is not a whole number.
+    @staticmethod
+    def score(value):
+        if value is None or value == "":
+            return 0
+        if isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                return None
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return None  # a fraction such as 5.9 is not truncated, since the score would not be the one in the file.
+
+    # goes through every valid account in a file as a row of FIELDS, recording the accounts that are not valid.
+    def read(self, file, file_format: str):
+        for line_no, record in self.records(file, file_format):
+            if isinstance(record, str):
+                self.rejected.append((line_no, None, record))
+                continue
+            missing = [field for field in self.REQUIRED if record.get(field) is None]
+            username, password = str(record.get("Username") or ""), str(record.get("Password") or "")
+            score = self.score(record.get("Score"))
+            if missing:
+                problem = "The account has no {}!".format(" or ".join(missing))
+            else:
+                problem = check_name(username) or check_pass(password)  # the same rules as signing up.
+            if problem is None and score is None:
+                problem = "The score should be a whole number!"
+            if problem is not None:
+                self.rejected.append((line_no, username or None, problem))
+            else:
+                yield username, password, score
+
+    # imports every valid account in a file, committing a batch at a time, and returns how many were imported.
+    def import_file(self, path: str, file_format: str = None):
+        file_format, imported = self.file_format(path, file_format), 0
+        self.rejected = []
+        with open(path, newline="", encoding="utf-8-sig") as file:  # files saved by Excel start with a BOM.
+            rows = self.read(file, file_format)
+            batch = list(islice(rows, self.batch_size))
+            while batch:
+                with self.manager.transaction():
+                    self.manager.execute_many(self.UPSERT, batch)
+                imported += len(batch)
+                batch = list(islice(rows, self.batch_size))
+        return imported
+
+    # exports every account in the order they were registered in, and returns how many were exported.
+    def export_file(self, path: str, file_format: str = None):
+        file_format, exported = self.file_format(path, file_format), 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file) if file_format == "csv" else None
+            if writer is not None:
+                writer.writerow(self.FIELDS)
+            for rows in self.manager.select_chunks(self.ROWS, size=self.batch_size):
+                if writer is not None:
+                    writer.writerows(rows)
+                else:
+                    file.write("".join(json.dumps(dict(zip(self.FIELDS, row))) + "\n" for row in rows))
+                exported += len(rows)
+        return exported
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Imports or exports the registered players.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--database", default="Database.db")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    arguments = parser.parse_args()
+
+    db = SQLManager(arguments.database)
+    accounts = Accounts(db, arguments.batch_size)
+    if arguments.action == "import":
+        print("Imported {} accounts.".format(accounts.import_file(arguments.path, arguments.format)))
+        for line_no, username, problem in accounts.rejected:
+            print("Line {0} was not imported. {1}".format(line_no, problem))
+    else:
+        print("Exported {} accounts.".format(accounts.export_file(arguments.path, arguments.format)))
+    db.close()
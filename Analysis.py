@@ -0,0 +1,91 @@
+from bisect import bisect_left
+from fractions import Fraction
+from itertools import product
+
+
+class ScoreDistribution(object):
+    """
+    Calculates the exact probability of every final score of a player in play_games, combining the
+    outcomes of every roll round by round instead of simulating games. Every probability is a Fraction,
+    so nothing suffers from sampling noise or rounding.
+
+    :argument rounds: The amount of rounds in a game before the tie-breaker.
+    """
+
+    # the same rules that Dice uses when rolling 2 dices.
+    rolled_double = staticmethod(lambda rolls: rolls.count(rolls[0]) == len(rolls))
+    rolled_even = staticmethod(lambda rolls: sum(rolls) % 2 == 0)
+    rolled_odd = staticmethod(lambda rolls: not ScoreDistribution.rolled_even(rolls))
+
+    # initialises variables as an instance is made.
+    def __init__(self, rounds: int = 5):
+        self.rounds = rounds
+        self.roll = self.roll_distribution()
+        self.memo = {}
+
+    # returns the probability of every amount of points that Dice.roll can give from 2 dices.
+    def roll_distribution(self):
+        outcomes = {}
+
+        # adds the probability of gaining an amount of points.
+        def add(points, probability):
+            outcomes[points] = outcomes.get(points, 0) + probability
+
+        for rolls in product(range(1, 7), repeat=2):
+            if self.rolled_double(list(rolls)):
+                for additional_roll in range(1, 7):
+                    add(sum(rolls) + additional_roll, Fraction(1, 36 * 6))
+            elif self.rolled_odd(list(rolls)):
+                add(sum(rolls) - 5, Fraction(1, 36))
+            elif self.rolled_even(list(rolls)):
+                add(sum(rolls) + 10, Fraction(1, 36))
+        return outcomes
+
+    # returns the probability of every score after an amount of rounds, starting from a score.
+    def after(self, rounds: int = None, start: int = 0):
+        rounds = self.rounds if rounds is None else rounds
+        if (rounds, start) not in self.memo:
+            if rounds == 0:
+                self.memo[(rounds, start)] = {start: Fraction(1)}
+            else:
+                scores = {}
+                for score, probability in self.after(rounds - 1, start).items():
+                    for points, chance in self.roll.items():
+                        score_after = max(score + points, 0)  # play_games resets a negative score to 0.
+                        scores[score_after] = scores.get(score_after, 0) + probability * chance
+                self.memo[(rounds, start)] = scores
+        return self.memo[(rounds, start)]
+
+    # returns the expected score after an amount of rounds, starting from a score.
+    def expected(self, rounds: int = None, start: int = 0):
+        return sum(score * probability for score, probability in self.after(rounds, start).items())
+
+    # returns the probability that 2 players have the same score at the end of the rounds.
+    def tie(self, start_one: int = 0, start_two: int = 0):
+        scores_two = self.after(start=start_two)
+        return sum(probability * scores_two.get(score, 0) for score, probability in self.after(start=start_one).items())
+
+    # returns the expected amount of tie-breaker rolls each player makes in a game.
+    def expected_tie_breaks(self, start_one: int = 0, start_two: int = 0):
+        """
+        Once tied, both players roll 1 die each and stay tied only if both dices are the same, which has a
+        probability of 1/6. The amount of tie-breaker rolls is therefore geometric with an expected length of 6/5.
+        """
+        return self.tie(start_one, start_two) * Fraction(6, 5)
+
+    # returns the expected final score of the first player, including the die they roll in every tie-breaker round.
+    def expected_final(self, start_one: int = 0, start_two: int = 0):
+        return self.expected(start=start_one) + self.expected_tie_breaks(start_one, start_two) * Fraction(7, 2)
+
+    # returns the probability that the first player wins the game, including the tie-breaker.
+    def win(self, start_one: int = 0, start_two: int = 0):
+        scores_two = self.after(start=start_two)
+        ordered, below, total = sorted(scores_two), [], 0
+        for score in ordered:  # the probability that the second player finishes below each score.
+            below.append(total)
+            total += scores_two[score]
+        below.append(total)
+
+        win = sum(probability * below[bisect_left(ordered, score)]
+                  for score, probability in self.after(start=start_one).items())
+        return win + self.tie(start_one, start_two) / 2  # the tie-breaker is fair for both players.
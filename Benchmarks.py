@@ -0,0 +1,215 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+
+from Migrations import MigrationRunner
+from Utils import Menu, OutputBuffer, SQLManager, Util
+
+
+class Benchmarks(object):
+    """
+    Times the paths of the game that everything else depends on: rolling dices, displaying menus, dividing
+    strings and reading or writing players through SQLManager. Every benchmark runs offline against a temporary
+    database and the results can be saved as JSON, so that the results of two commits can be compared.
+
+    :argument sizes: The amounts of players that the database benchmarks are run with.
+
+    :argument repeat: The amount of times each benchmark is run, of which the quickest run is kept.
+
+    :argument seed: Seeds the random values used by the benchmarks.
+    """
+
+    # the amount of single statements timed by each database benchmark.
+    LOOKUPS = 1000
+
+    # the amount of threads that read through a pooled SQLManager at once.
+    THREADS = 4
+
+    # initialises variables as an instance is made.
+    def __init__(self, sizes=(1000, 10000, 100000, 1000000), repeat: int = 3, seed: int = 0):
+        self.sizes, self.repeat = sizes, repeat
+        self.random = random.Random(seed)
+        self.results = []
+
+    # times a function, keeping the quickest of every repeat, and records it under a name and its parameters.
+    def time(self, name: str, function, ops: int = 1, setup=None, **params):
+        times = []
+        for ignored in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        result = {"name": name, "params": params, "ops": ops, "seconds": min(times), "per_op": min(times) / ops}
+        self.results.append(result)
+        print("{:<24} {:<56} {:>12.3f} us/op".format(name, json.dumps(params), result["per_op"] * 1e6),
+              file=sys.stderr)
+        return result
+
+    # times rolling dices with their output collected rather than printed.
+    def bench_dice(self, rolls: int = 100000):
+        from DiceGame import Dice, DiceRNG
+        output = OutputBuffer()
+        dice = Dice(output=output, rng=DiceRNG(self.random.getrandbits(63)))
+
+        # rolls the dices, emptying the output as a game would after every turn.
+        def roll():
+            for ignored in range(rolls):
+                dice.roll()
+                output.take()
+
+        self.time("dice.roll", roll, rolls)
+
+    # times displaying menus with more and longer options, both plain and pretty-printed.
+    def bench_menu(self, counts=(5, 50, 500), lengths=(10, 100, 1000), displays: int = 20):
+        words = ["sign", "up", "in", "play", "another", "game", "leaderboard", "tournament", "a", "settings"]
+        for count in counts:
+            for length in lengths:
+                options = [" ".join(self.random.choice(words) for ignored in range(length // 5 + 1))[:length]
+                           for ignored in range(count)]
+                for pretty_print in (False, True):
+                    # displays the menu as if it was new every time, so that it has to be rendered.
+                    def display():
+                        for ignored in range(displays):
+                            Menu.rendered.clear()
+                            menu = Menu(title="Benchmark Menu Title", pretty_print=pretty_print)
+                            for option in options:
+                                menu.add(option)
+                            menu.display(printed=False)
+
+                    self.time("menu.display", display, displays, options=count, length=length,
+                              pretty_print=pretty_print)
+
+    # times dividing longer and longer strings into chunks.
+    def bench_divide_string(self, lengths=(1000, 100000, 1000000), width: int = 20):
+        for length in lengths:
+            string = "".join(self.random.choice("abcdefgh ") for ignored in range(length))
+            self.time("util.divide_string", lambda: Util.String.divide_string(string, width), 1, length=length,
+                      width=width)
+
+    # times reading and writing players through SQLManager with a table of every size.
+    def bench_database(self):
+        for size in self.sizes:
+            directory = tempfile.mkdtemp()
+            path = os.path.join(directory, "Benchmark.db")
+            db = SQLManager(path)
+            MigrationRunner(db).migrate()
+            rows = [("player{}".format(i), "pass#{}".format(i), self.random.randint(0, 500)) for i in range(size)]
+            usernames = [self.random.choice(rows)[0] for ignored in range(self.LOOKUPS)]
+
+            # empties the table before the players are inserted again.
+            def empty():
+                db.execute_statement("DELETE FROM Users")
+
+            self.time("sql.insert_many", lambda: db.insert_many("Users", ["Username", "Password", "Score"], rows),
+                      size, setup=empty, rows=size)
+            self.time("sql.insert_value", lambda: [db.insert_value("Users", Username="extra{}".format(i),
+                                                                   Password="pass#1", Score=0)
+                                                   for i in range(self.LOOKUPS)],
+                      self.LOOKUPS, setup=lambda: db.execute_statement("DELETE FROM Users WHERE Username LIKE ?",
+                                                                       ("extra%",)), rows=size)
+            self.time("sql.update_value", lambda: [db.update_value("Users", "Username == ?", (username,), Score=1)
+                                                   for username in usernames], self.LOOKUPS, rows=size)
+            self.time("sql.update_many", lambda: db.update_many("Users", "Username == ?", ["Score"],
+                                                                [(2, username) for username in usernames]),
+                      self.LOOKUPS, rows=size)
+            self.time("sql.select_value", lambda: [db.select_value("Users", "Username == ?", True, "Score",
+                                                                   params=(username,)) for username in usernames],
+                      self.LOOKUPS, rows=size)
+            self.time("sql.value_exists", lambda: [db.value_exists("Users", "Username == ?", (username,))
+                                                   for username in usernames], self.LOOKUPS, rows=size)
+            db.close()
+
+            # looks players up from many threads at once while another thread writes their scores.
+            pooled = SQLManager(path, pooled=True)
+
+            def read_concurrently():
+                threads = [threading.Thread(target=lambda: [pooled.value_exists("Users", "Username == ?", (username,))
+                                                            for username in usernames])
+                           for ignored in range(self.THREADS)]
+                threads.append(threading.Thread(target=lambda: [pooled.update_value(
+                    "Users", "Username == ?", (username,), Score=3) for username in usernames[:100]]))
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            self.time("sql.pooled_reads", read_concurrently, self.LOOKUPS * self.THREADS, rows=size,
+                      threads=self.THREADS)
+            pooled.close()
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            os.remove(path)
+            os.rmdir(directory)
+
+    # runs every benchmark, returning the results along with what they were run on.
+    def run(self, only=None):
+        benchmarks = {"dice": self.bench_dice, "menu": self.bench_menu, "string": self.bench_divide_string,
+                      "database": self.bench_database}
+        for name, benchmark in benchmarks.items():
+            if (only is None) or (name in only):
+                benchmark()
+        return {"commit": self.commit(), "python": platform.python_version(), "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": self.results}
+
+    # returns the commit that the benchmarks were run on, if the project is a git repository.
+    @staticmethod
+    def commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+        except OSError:
+            return None
+
+    # compares results with earlier results, returning every benchmark that became slower than the threshold.
+    @staticmethod
+    def compare(current, baseline, threshold: float = 1.2):
+        key = lambda result: (result["name"], json.dumps(result["params"], sort_keys=True))
+        earlier = {key(result): result for result in baseline["results"]}
+        regressions = []
+        for result in current["results"]:
+            before = earlier.get(key(result))
+            if before is None:
+                continue
+            ratio = result["per_op"] / before["per_op"]
+            print("{:<24} {:<56} {:>8.2f}x".format(result["name"], json.dumps(result["params"]), ratio),
+                  file=sys.stderr)
+            if ratio > threshold:
+                regressions.append((result["name"], result["params"], ratio))
+        return regressions
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Times the game, rendering and persistence paths.")
+    parser.add_argument("--only", nargs="+", choices=["dice", "menu", "string", "database"], default=None)
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                        default=[1000, 10000, 100000, 1000000], help="comma-separated amounts of players")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="where the results are saved as JSON")
+    parser.add_argument("--compare", default=None, help="earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="how much slower counts as a regression")
+    arguments = parser.parse_args()
+
+    results = Benchmarks(arguments.sizes, arguments.repeat, arguments.seed).run(arguments.only)
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            slower = Benchmarks.compare(results, json.load(file), arguments.threshold)
+        for name, params, ratio in slower:
+            print("Regression: {} {} is {:.2f}x slower".format(name, json.dumps(params), ratio), file=sys.stderr)
+        sys.exit(1 if slower else 0)
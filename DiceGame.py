@@ -1,17 +1,29 @@
-from src.Utils import *  # importing my external file for accessibility to utilising classes.
-from random import randint
-
-# global variables of the program.
-db = SQLManager("Database.db")
+from Utils import *  # importing my external file for accessibility to utilising classes.
+from Migrations import MigrationRunner
+from Match import Match
+from MatchLog import MatchLog
+from Leaderboard import Leaderboard, TopScores
+from argparse import ArgumentParser
+from random import Random
+from secrets import randbits
+
+# global variables of the program. Importing the program has no side effects: the database is only connected
+# to once it is first used.
+db = SQLManager("Database.db", cache_size=128)
 menu = Menu
 users = {}
+screen = OutputBuffer()  # collects the output of a turn so that it is written at once.
+match_log = MatchLog("Matches.log")  # records every step of every game.
+top_players = TopScores(db)  # the highest scores, kept up to date as scores are stored.
 
 
 # The main body of the program.
-def main():
-    handle_users()
+def main(players: int = 2, seed: int = None):
+    MigrationRunner(db).migrate()  # brings an older database up to the latest schema.
+    handle_users(players)
     while True:
-        play_games()
+        play_games(seed)
+        seed = None  # only the first game is played again from the seed, every other game has a seed of its own.
         store_scores()
         display_scores()
         try:
@@ -23,8 +35,8 @@ def main():
     db.close()
 
 
-# gets a validated password from user for stricter authentication when signing up.
-def get_validated_pass():
+# returns why a password is not strict enough when signing up, or None if it is valid.
+def check_pass(password: str):
     # checks if a string contains a number.
     def contains_number(text: str):
         for word in text:
@@ -48,26 +60,38 @@ def get_validated_pass():
         return False
 
     # main code of the function.
+    if (len(password) < 6) or (len(password) > 12):
+        return "Your password is supposed to be between 6-12 characters!"
+    elif not (contains_symbol(password) and contains_number(password) and contains_letter(password)):
+        return "Your password needs to contain a symbol, a number and/or a letter!"
+    return None
+
+
+# returns why a username is not valid when signing up, or None if it is valid.
+def check_name(username: str):
+    if len(username) < 3:  # checks if the length of the username is not empty and is greater than or equal to 3 characters.
+        return "Your username should be minimum 6 characters long!"
+    return None
+
+
+# gets a validated password from user for stricter authentication when signing up.
+def get_validated_pass():
     while True:
         password = input("Please enter your password: ")
-        if (len(password) < 6) or (len(password) > 12):
-            print("Your password is supposed to be between 6-12 characters!")
-        elif contains_symbol(password) and contains_number(password) and contains_letter(password):
+        problem = check_pass(password)
+        if problem is None:
             return password
-        else:
-            print("Your password needs to contain a symbol, a number and/or a letter!")
+        print(problem)
 
 
 # gets a validated username from user for stricter authentication when signing up.
 def get_validated_name():
-    global db  # accessing global database variable.
     while True:
         username = input("Please enter your username: ")
-        if len(
-                username) >= 3:  # checks if the length of the username is not empty and is greater than or equal to 3 characters.
+        problem = check_name(username)
+        if problem is None:
             return username
-        else:
-            print("Your username should be minimum 6 characters long!")
+        print(problem)
 
 
 # gets a validated option from the user when dealing with menus.
@@ -83,17 +107,25 @@ def get_validated_option(menu_inst: Menu):
             print("Please do not input a character.")
 
 
-# manages sign in/up section for 2 players and appends them onto the dictionary.
-def handle_users():
-    global menu, db, users  # globalises variables as python only sess local variables as accessible here.
+# checks if a player is in the database.
+def user_exists(username: str, password: str, manager: SQLManager = None):
+    return (manager or db).value_exists("Users", "Username == ? AND Password == ?", (username, password))
 
-    # checks if a player is in the database.
-    def user_exists(username: str, password: str):
-        return db.value_exists("Users", "Username == {} AND Password == {}".format(repr(username), repr(password)))
 
-    # checks if there is a username in the database.
-    def username_exists(username: str):
-        return db.value_exists("Users", "Username == {}".format(repr(username)))
+# checks if there is a username in the database.
+def username_exists(username: str, manager: SQLManager = None):
+    return (manager or db).value_exists("Users", "Username == ?", (username,))
+
+
+# returns the Id of a player in the Users table, which identifies them in the match log.
+def user_id(username: str, manager: SQLManager = None):
+    row = (manager or db).select_value("Users", "Username == ?", True, "Id", params=(username,))
+    return row[0] if row is not None else 0
+
+
+# manages sign in/up section for every player (2 by default) and appends them onto the dictionary.
+def handle_users(players: int = 2):
+    global menu, db, users  # globalises variables as python only sess local variables as accessible here.
 
     # registers a new account for a player.
     def register_user():
@@ -103,7 +135,8 @@ def handle_users():
         password = get_validated_pass()
 
         if (not user_exists(username, password)) and (not username_exists(username)):
-            db.insert_value("Users", Username=username, Password=password, Score="0")
+            db.insert_value("Users", Username=username, Password=password, Score=0)
+            top_players.update(username, 0)
             users[username] = 0
             print("Account created successfully! Welcome", username)
         else:
@@ -127,7 +160,7 @@ def handle_users():
             if username in users.keys():  # if player 1/2 already signed in as the user.
                 print("A user already logged into that account. Please try again")
             elif user_exists(username, password):
-                users[username] = db.select_value("Users", "Username == {}".format(repr(username)), True, "Score")[0]
+                users[username] = db.select_value("Users", "Username == ?", True, "Score", params=(username,))[0]
                 print("Login successful! Welcome", username)
                 break
             elif i + 1 == 3:  # if the loop is iterating for the last time and the user failed to sign in.
@@ -138,13 +171,52 @@ def handle_users():
                 print("Username and/or password is incorrect. Please try again.")
 
     # main code of handle users function.
-    for i in range(2):
+    for i in range(players):
         menu = Menu(title="Account Management", pretty_print=True) \
             .add("Sign up").add("Sign in")
         option = get_validated_option(menu)
         {1: lambda: register_user(), 2: lambda: login_user()}[option]()
 
 
+class DiceRNG(object):
+    """
+    Generates dice values in large blocks ahead of time and hands them out one at a time, using NumPy's
+    generator when it is installed. A game can be played again exactly by using the same seed, block size
+    and generator.
+
+    :argument seed: The seed of the generator. If this argument is not passed, a random seed is chosen and
+                    kept in the seed variable so that it can still be reproduced.
+
+    :argument block_size: The amount of values that are generated at once.
+
+    :argument use_numpy: Whether NumPy's generator is used when it is installed.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, seed: int = None, block_size: int = 4096, use_numpy: bool = True):
+        self.seed = seed if seed is not None else randbits(63)
+        self.block_size = block_size
+        try:
+            import numpy  # generates dice values much faster when it is installed.
+        except ImportError:
+            numpy = None
+        if use_numpy and (numpy is not None):
+            generator = numpy.random.default_rng(self.seed)
+            self.generate = lambda: generator.integers(1, 7, size=self.block_size).tolist()
+        else:
+            generator = Random(self.seed)
+            self.generate = lambda: generator.choices(range(1, 7), k=self.block_size)
+        self.values = iter(())
+
+    # returns the value of the next die, generating another block once every value has been handed out.
+    def roll(self):
+        try:
+            return next(self.values)
+        except StopIteration:
+            self.values = iter(self.generate())
+            return next(self.values)
+
+
 class Dice(object):
     """
     Rolls 2 dices and returns a textually generated dice face along with the points which are calculated
@@ -152,34 +224,49 @@ class Dice(object):
 
     :argument pip: The symbol used to traditionally denote the number of a face, arranged in a particular
                    pattern.
+
+    :argument output: The buffer that the faces and messages are written to, which is then flushed by whoever
+                      passed it. If this argument is not passed, every roll is written out once it has finished.
+
+    :argument rng: Where the values of the dices come from. If this argument is not passed, a DiceRNG with a
+                   random seed is used.
     """
 
+    # the text of every face and pair of faces, made once for each pip symbol that is used.
+    glyphs = {}
+
     # when an instance is made.
-    def __init__(self, pip: str = "o"):
+    def __init__(self, pip: str = "o", output: OutputBuffer = None, rng: DiceRNG = None):
         self.pip = pip
+        self.rng = rng if rng is not None else DiceRNG()
+        self.rolls = []
+        self.faces = Dice.get_faces(pip)
+        self.output, self.auto_flush = (output, False) if output is not None else (OutputBuffer(), True)
 
         # lambda expressions which are signified as the rules when rolling 2 dices.
         self.rolled_double = lambda rolls: rolls.count(rolls[0]) == len(rolls)
         self.rolled_even = lambda rolls: sum(rolls) % 2 == 0
         self.rolled_odd = lambda rolls: not self.rolled_even(rolls)
 
-    # rolls 1 or 2 dices and returns the points gained at the end of rolling them.
-    def roll(self, one_die: bool = False):
-        # returns 2 dice faces designed for output.
-        def roll_dices(pip, roll: int, roll2: int = None):
+    # returns the text of every roll of 1 or 2 dices drawn with a pip, making them the first time the pip is used.
+    @staticmethod
+    def get_faces(pip: str):
+        if pip not in Dice.glyphs:
             can_pip = lambda condition: pip if not condition else " "
             pattern_checks = lambda r: [can_pip(r < x) for x in range(2, 5, 2)] + [can_pip(r != 6), can_pip(r % 2 == 0)]
-            die_format = ["+-----+", "| {0} {1} |", "| {2}{3}{2} |", "| {1} {0} |", "+-----+"] * \
-                         (2 if roll2 is not None else 1)
-            die_faces = ""
-            for i in range(5):
-                die_faces += die_format[i].format(*(x for x in pattern_checks(roll))) + \
-                             ("\t\t" + die_format[i + 5].format(
-                                 *(x for x in pattern_checks(roll2))) if roll2 is not None else "") + "\n"
-            return die_faces
-
-        rolls = [randint(1, 6) for ignored in range(2 if one_die is False else 1)]
-        output_face = lambda rs: print(roll_dices(self.pip, *(rs[x] for x in range(len(rs)))))
+            die_format = ["+-----+", "| {0} {1} |", "| {2}{3}{2} |", "| {1} {0} |", "+-----+"]
+            rows = {roll: [row.format(*pattern_checks(roll)) for row in die_format] for roll in range(1, 7)}
+
+            # 2 dice faces are placed side by side, row by row.
+            Dice.glyphs[pip] = {rolls: "".join("\t\t".join(rows[roll][i] for roll in rolls) + "\n" for i in range(5))
+                                for rolls in [(roll,) for roll in rows] + [(roll, roll2) for roll in rows for roll2 in rows]}
+        return Dice.glyphs[pip]
+
+    # rolls 1 or 2 dices and returns the points gained at the end of rolling them.
+    def roll(self, one_die: bool = False):
+        rolls = [self.rng.roll() for ignored in range(2 if one_die is False else 1)]
+        self.rolls = rolls  # the values of every die in the latest roll, including an additional roll.
+        output_face = lambda rs: self.output.print(self.faces[tuple(rs)])
 
         output_face(rolls)
         points = sum(rolls)
@@ -188,89 +275,191 @@ class Dice(object):
         if not one_die:
             # calculating points for the player.
             if self.rolled_double(rolls):
-                print("You get to roll an extra die since you rolled a double!")
-                additional_roll = randint(1, 6)
+                self.output.print("You get to roll an extra die since you rolled a double!")
+                additional_roll = self.rng.roll()
+                self.rolls = rolls + [additional_roll]
                 output_face([additional_roll])
                 points += additional_roll
             elif self.rolled_odd(rolls):
-                print("Oh no! The sum of your dices is an odd number!")
+                self.output.print("Oh no! The sum of your dices is an odd number!")
                 points -= 5
                 is_odd = True
             elif self.rolled_even(rolls):
-                print("Yes! The sum of your dices is an even number so you will receive an additional 10 points!")
+                self.output.print("Yes! The sum of your dices is an even number so you will receive an additional 10 points!")
                 points += 10
 
+        if self.auto_flush:
+            self.output.flush()
         return points, is_odd
 
 
-# creates a game session between the 2 players.
-def play_games():
-    global users
-
-    # Checks if a player has a higher score or both players have same score.
-    def winner(player_one, player_two):
-        global users
-        pone_win = users[player_one] > users[player_two]
-        difference = users[player_one] - users[player_two] if pone_win else users[player_two] - users[player_one]
-        if difference != 0:
-            print("{0} wins with {1} more points than {2}!"
-                  .format(player_one if pone_win else player_two, difference, player_two if pone_win else player_one))
-        return difference != 0
-
-    print("\nLet the games begin!")
-    dice = Dice()
-
-    # The game will last 5 rounds.
-    for i in range(5):
-        print("\n ----   Round {}   ---- ".format(str(i + 1)))
-        for username in users:
-            print("\n\t\t{0}'s turn:".format(username))
-            points, is_odd = dice.roll()
-            difference = 0 if points == 0 else (
-                (users[username] + points) if (users[username] > points) or is_odd else (points + users[username]))
-            if difference >= 0:
-                users[username] += points
-                print("{0} gained {1} points from this round, with an overall score of {2}!"
-                      .format(username, "no" if difference == 0 else str(points), users[username]))
-            else:
-                users[username] = 0
-                print("{} could not gain points from this round; the sum of his/her dices is an odd!".format(username))
-
-            input("Press enter to continue")
-
-    # if both players have same score.
-    if not winner(*(username for username in users)):
-        print("\nBoth players have the same at the end of 5 rounds! A tie-breaker will commence!\n")
-        while not winner(*(username for username in users)):  # while both players have the same score.
-            for username in users:
-                print("\n\t\t{0}'s turn:".format(username))
-                points = dice.roll(one_die=True)[0]
-                users[username] += points
-                input("Press enter to continue")
-
-            if winner(*(username for username in users)):
-                break
-
-
-# stores the scores of both users.
-def store_scores():
-    global db, users
-    for username in users:
-        db.update_value(repr("Users"), "Username == '{}'".format(username), Score=str(users[username]))
+# creates a game session between the signed in players, which can be played again by passing its seed.
+def play_games(seed: int = None):
+    global users, screen, match_log
+
+    dice = Dice(output=screen, rng=DiceRNG(seed))
+    match = Match(users, dice, [users[username] for username in users])
+    screen.print("\nLet the games begin! (game seed: {})".format(dice.rng.seed))
+    players = [user_id(username) for username in match.players]
+
+    # The game will last 5 rounds, followed by a tie-breaker between the players sharing the highest score.
+    tie_breaker = False
+    for round_no, player, one_die in match.turns():
+        username = match.players[player]
+        if (not one_die) and player == 0:
+            screen.print("\n ----   Round {}   ---- ".format(str(round_no)))
+        elif one_die and not tie_breaker:  # if more than one player has the highest score.
+            tied = len(match.leaders())
+            screen.print("\n{} players have the same at the end of 5 rounds! A tie-breaker will commence!\n"
+                         .format("Both" if tied == 2 else tied))
+            tie_breaker = True
+        screen.print("\n\t\t{0}'s turn:".format(username))
+        points, reset = match.turn(player, one_die)
+        if reset:
+            screen.print("{} could not gain points from this round; the sum of his/her dices is an odd!".format(username))
+        elif not one_die:
+            screen.print("{0} gained {1} points from this round, with an overall score of {2}!".format(
+                username, "no" if (points == 0) or (match.scores[player] == 0) else str(points), match.scores[player]))
+        match_log.turn(dice.rng.seed, players[player], round_no, dice.rolls, match.scores[player], reset)
+
+        screen.flush()  # the whole turn is written at once.
+        input("Press enter to continue")
+
+    runner_up, difference = match.runner_up()
+    screen.print("{0} wins with {1} more points than {2}!".format(match.players[match.winner], difference,
+                                                                 match.players[runner_up]))
+    screen.flush()
+    users.update(match.results())
+
+    match_log.append(dice.rng.seed, players[match.winner], match.round_no, MatchLog.WIN,
+                     score=match.scores[match.winner])
+    match_log.flush()
+
+
+# stores the scores of the players (both users by default) in a single transaction, along with the top scores.
+def store_scores(players: dict = None, manager: SQLManager = None, board: TopScores = None):
+    global db, users, top_players
+    players = users if players is None else players
+    board = top_players if manager is None else board
+    (manager or db).update_many("Users", "Username == ?", ["Score"],
+                                [(players[username], username) for username in players])
+    if board is not None:
+        board.update_many(players)
 
 
 # Displays top 5 players with the highest score in descending order.
-def display_scores():
-    global db, users
-
-    db.execute_statement_cursor("SELECT Username, Score FROM Users ORDER BY Score DESC LIMIT 5")
-    top_scores = db.c.fetchall()
-    print("\n\t\tTop {} Players:".format(len(top_scores)))
+# If an output is passed, the scores are written to it and left for the caller to take.
+def display_scores(manager: SQLManager = None, board: TopScores = None, output: OutputBuffer = None):
+    global db, users, screen, top_players
+    board = top_players if manager is None else board
+    output = screen if output is None else output
+
+    top_scores = board.top(5) if board is not None else Leaderboard(manager).top(5)
+    output.print("\n\t\tTop {} Players:".format(len(top_scores)))
     for i in range(len(top_scores)):
-        print("{0}. {1}  --  Score: {2}".format(str(i + 1), top_scores[i][0], top_scores[i][1]))
+        output.print("{0}. {1}  --  Score: {2}".format(str(i + 1), top_scores[i][0], top_scores[i][1]))
+    if output is screen:
+        screen.flush()
+
+
+# plays games without any output, showing how the scores of the players are spread.
+def simulate(games: int, seed: int = None, players: int = 2, exact: bool = False):
+    from Simulation import DiceSimulator  # NumPy is only imported by the commands that need it.
+    scores, tie_breaks = DiceSimulator(players=players, seed=seed).play(games)
+    wins = [int(count) for count in (DiceSimulator.winners(scores)[:, None] == range(players)).sum(axis=0)]
+    print("Played {} games between {} players.".format(games, players))
+    for player in range(players):
+        print("Player {0}: mean score {1:.2f}, won {2:.2%}".format(player + 1, scores[:, player].mean(),
+                                                                   wins[player] / games))
+    print("Tie-breakers: {0:.2%} of games, {1:.3f} rolls on average".format((tie_breaks > 0).mean(),
+                                                                           tie_breaks.mean()))
+    if exact and players == 2:
+        from Analysis import ScoreDistribution
+        distribution = ScoreDistribution()
+        print("Exactly: mean score {0:.2f} ({1:.2f} before the tie-breaker), tie {2:.2%}, "
+              "{3:.3f} tie-breaker rolls on average".format(float(distribution.expected_final()),
+                                                          float(distribution.expected()), float(distribution.tie()),
+                                                          float(distribution.expected_tie_breaks())))
+
+
+# shows a page of the leaderboard, or the rank of a player.
+def show_leaderboard(amount: int = 5, after: str = None, username: str = None):
+    MigrationRunner(db).migrate()
+    board = Leaderboard(db)
+    if username is not None:
+        rank = board.rank(username)
+        print("{} is not registered.".format(username) if rank is None else "{0} is ranked {1}.".format(username,
+                                                                                                    rank))
+        return
+    start = None
+    if after is not None:
+        row = db.select_value("Users", "Username == ?", True, "Username", "Score", params=(after,))
+        start = tuple(row) if row is not None else None
+    for username, score in board.page(start, amount):
+        print("{0}  --  Score: {1}".format(username, score))
+
+
+# registers every valid account in a CSV or JSON Lines file, replacing the accounts that are already registered.
+def import_users(path: str, file_format: str = None):
+    from Accounts import Accounts  # Accounts uses the checks of this program, so it is imported once they exist.
+    accounts = Accounts(db)
+    print("Imported {} accounts.".format(accounts.import_file(path, file_format)))
+    for line_no, username, problem in accounts.rejected:
+        print("Line {0} was not imported. {1}".format(line_no, problem))
+
+
+# writes every account into a CSV or JSON Lines file.
+def export_users(path: str, file_format: str = None):
+    from Accounts import Accounts
+    print("Exported {} accounts.".format(Accounts(db).export_file(path, file_format)))
+
+
+# reads the command that the program was run with, playing the game if no command is given.
+def cli(arguments: list = None):
+    parser = ArgumentParser(description="The dice game.")
+    parser.add_argument("--database", default="Database.db", help="the location of the database")
+    commands = parser.add_subparsers(dest="command")
+    parser.set_defaults(players=2, seed=None)
+    play_parser = commands.add_parser("play", help="play a game between the players (the default)")
+    play_parser.add_argument("--players", type=int, default=2, help="the amount of players, at least 2")
+    play_parser.add_argument("--seed", type=int, default=None, help="play the first game again from its seed")
+    simulate_parser = commands.add_parser("simulate", help="play many games without any output")
+    simulate_parser.add_argument("--games", type=int, default=1000000)
+    simulate_parser.add_argument("--players", type=int, default=2)
+    simulate_parser.add_argument("--seed", type=int, default=None)
+    simulate_parser.add_argument("--exact", action="store_true", help="also show the exact probabilities")
+    leaderboard_parser = commands.add_parser("leaderboard", help="show the players with the highest scores")
+    leaderboard_parser.add_argument("--amount", type=int, default=5)
+    leaderboard_parser.add_argument("--after", default=None, help="start the page after this player")
+    leaderboard_parser.add_argument("--rank", default=None, help="show the rank of this player")
+    import_parser = commands.add_parser("import", help="register the accounts in a CSV or JSON Lines file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    export_parser = commands.add_parser("export", help="write every account into a CSV or JSON Lines file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    arguments = parser.parse_args(arguments)
+
+    db.url = arguments.database
+    try:
+        if arguments.command == "simulate":
+            simulate(arguments.games, arguments.seed, arguments.players, arguments.exact)
+        elif arguments.command == "leaderboard":
+            show_leaderboard(arguments.amount, arguments.after, arguments.rank)
+        elif arguments.command == "import":
+            import_users(arguments.path, arguments.format)
+        elif arguments.command == "export":
+            export_users(arguments.path, arguments.format)
+        elif arguments.players < 2:
+            parser.error("a game needs at least 2 players")
+        else:
+            main(arguments.players, arguments.seed)
+    finally:
+        db.close()
 
 
-main()
+if __name__ == "__main__":
+    cli()
 
 """
 DOCUMENT CHANGES MADE AT play_games()
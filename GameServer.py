@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import sqlite3
+from argparse import ArgumentParser
+
+from DiceGame import Dice, DiceRNG, check_name, check_pass, display_scores, store_scores, user_exists, user_id, \
+    username_exists
+from Leaderboard import TopScores
+from Match import Match
+from MatchLog import MatchLog
+from Migrations import MigrationRunner
+from Utils import Menu, OutputBuffer, SQLManager
+
+
+class Session(object):
+    """
+    Holds the state of a single player connected to the server, in place of the global variables that
+    DiceGame uses for the players sitting at the terminal.
+
+    :argument reader: The stream that the player's lines are read from.
+
+    :argument writer: The stream that the server's text is written to.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.username, self.score, self.user_id = None, 0, 0
+
+    # sends text to the player.
+    async def send(self, text: str = ""):
+        self.writer.write((text + "\n").encode())
+        await self.writer.drain()
+
+    # sends a prompt to the player and returns the line they reply with.
+    async def ask(self, prompt: str):
+        self.writer.write(prompt.encode())
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError("{} disconnected.".format(self.username or "A player"))
+        return line.decode(errors="replace").rstrip("\r\n")
+
+    # closes the connection to the player.
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GameServer(object):
+    """
+    Hosts many matches at once over a line protocol on TCP, where every connection is a player. Players
+    sign in or up, wait in a lobby until enough other players are free and then play a match using the same
+    rules as play_games. Every score is written by a single writer task that commits many matches at once, while the
+    accounts of players signing in are looked up on threads of their own so that matches are not held up.
+
+    :argument url: The location of the database.
+
+    :argument host: The address that the server listens on.
+
+    :argument port: The port that the server listens on.
+
+    :argument commit_delay: The amount of seconds the writer waits for other scores to share a commit.
+
+    :argument log_path: The location of the log that every step of every match is recorded in.
+
+    :argument players: The amount of players in every match.
+    """
+
+    # where matches that fail are logged.
+    logger = logging.getLogger("GameServer")
+
+    # initialises variables as an instance is made.
+    def __init__(self, url: str = "Database.db", host: str = "127.0.0.1", port: int = 8765,
+                 commit_delay: float = 0.05, log_path: str = "Matches.log", players: int = 2):
+        if players < 2:
+            raise ValueError("A match needs at least 2 players!")
+        self.db = SQLManager(url, cache_size=1024, pooled=True)
+        MigrationRunner(self.db).migrate()
+        self.host, self.port, self.commit_delay, self.players = host, port, commit_delay, players
+        self.output = OutputBuffer()
+        self.match_log = MatchLog(log_path)
+        self.top_players = TopScores(self.db)
+        self.signed_in = set()  # the usernames of every player connected to the server.
+        self.lobby, self.pending = None, None
+        self.server, self.tasks = None, []
+        self.matches = set()  # the tasks of the matches being played, which are kept until they are over.
+
+    # starts listening for players along with the matchmaker and the writer.
+    async def start(self):
+        self.lobby, self.pending = asyncio.Queue(), asyncio.Queue()
+        self.tasks = [asyncio.create_task(self.matchmaker()), asyncio.create_task(self.store_writer())]
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        return self
+
+    # serves players until the server is cancelled.
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    # stops the server after every pending score has been stored.
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+        matchmaker, store_writer = self.tasks
+        matchmaker.cancel()  # no new matches are made from the players leaving the cancelled ones.
+        for match in list(self.matches):
+            match.cancel()
+        await asyncio.gather(matchmaker, *self.matches, return_exceptions=True)
+        await self.pending.join()
+        self.match_log.flush()
+        store_writer.cancel()
+        self.db.close()
+
+    # manages a player from the moment they connect until they leave.
+    async def handle(self, reader, writer):
+        session = Session(reader, writer)
+        try:
+            if await self.authenticate(session):
+                while True:
+                    finished = asyncio.get_running_loop().create_future()
+                    await session.send("\nWaiting for another player...")
+                    await self.lobby.put((session, finished))
+                    completed = await finished
+                    if completed is None:  # another player left the match, so this player waits for another.
+                        continue
+                    if not completed:
+                        break
+                    again = (await session.ask("\nWould you like to play another game?: ")).lower()[:1]
+                    if again != "y":
+                        break
+        except ConnectionError:
+            pass
+        finally:
+            self.signed_in.discard(session.username)
+            await session.close()
+
+    # gets a validated option from a player, as get_validated_option does.
+    async def get_option(self, session: Session, menu_inst: Menu):
+        while True:
+            await session.send("\n" + menu_inst.display(printed=False))
+            try:
+                user_input = int(await session.ask("Please enter option (1-" + str(len(menu_inst.get_options())) + "): "))
+                if user_input in menu_inst.get_options().keys():
+                    return user_input
+            except ValueError:
+                await session.send("Please do not input a character.")
+
+    # signs a player in or up with the same rules as handle_users, returning whether they succeeded.
+    async def authenticate(self, session: Session):
+        menu = Menu(title="Account Management", pretty_print=True).add("Sign up").add("Sign in")
+        option = await self.get_option(session, menu)
+        if option == 1 and await self.register_user(session):
+            return True
+        return await self.login_user(session)
+
+    # registers a new account for a player, returning whether it was created.
+    async def register_user(self, session: Session):
+        await session.send("\n -- Registration Form -- ")
+        while True:
+            username = await session.ask("Please enter your username: ")
+            problem = check_name(username)
+            if problem is None:
+                break
+            await session.send(problem)
+        while True:
+            password = await session.ask("Please enter your password: ")
+            problem = check_pass(password)
+            if problem is None:
+                break
+            await session.send(problem)
+
+        if username not in self.signed_in:
+            self.signed_in.add(username)  # reserved while the account is made, so no one else signs in as it.
+            try:
+                if await self.create_account(session, username, password):
+                    await session.send("Account created successfully! Welcome " + username)
+                    return True
+            except BaseException:
+                self.signed_in.discard(username)
+                raise
+            self.signed_in.discard(username)
+        await session.send("You should be on login page! Redirecting you...\n")
+        return False
+
+    # stores a new account for a player, returning whether it was created.
+    async def create_account(self, session: Session, username: str, password: str):
+        if (await asyncio.to_thread(user_exists, username, password, self.db)) or \
+                (await asyncio.to_thread(username_exists, username, self.db)):
+            return False
+        try:
+            await asyncio.to_thread(self.db.insert_value, "Users", Username=username, Password=password, Score=0)
+        except sqlite3.IntegrityError:  # another player registered the username at the same time.
+            return False
+        self.top_players.update(username, 0)
+        session.score = 0
+        session.user_id = await asyncio.to_thread(user_id, username, self.db)
+        session.username = username
+        return True
+
+    # logs a player in, returning whether they succeeded within 3 attempts.
+    async def login_user(self, session: Session):
+        await session.send("\n --    Login Form    -- ")
+        for i in range(3):
+            username = await session.ask("Please enter your username: ")
+            password = await session.ask("Please enter your password: ")
+
+            if username in self.signed_in:  # if another player already signed in as the user.
+                await session.send("A user already logged into that account. Please try again")
+                continue
+            self.signed_in.add(username)  # reserved while the account is looked up, so no one else signs in as it.
+            try:
+                if await asyncio.to_thread(user_exists, username, password, self.db):
+                    session.score = (await asyncio.to_thread(self.db.select_value, "Users", "Username == ?", True,
+                                                             "Score", params=(username,)))[0]
+                    session.user_id = await asyncio.to_thread(user_id, username, self.db)
+                    session.username = username
+                    await session.send("Login successful! Welcome " + username)
+                    return True
+            except BaseException:
+                if session.username != username:
+                    self.signed_in.discard(username)
+                raise
+            self.signed_in.discard(username)
+            # if the username or password is incorrect or does not exist in the database.
+            await session.send("Username and/or password is incorrect. Please try again.")
+        await session.send("You exceeded the amount of times it takes to sign in!")
+        return False
+
+    # groups players from the lobby into matches.
+    async def matchmaker(self):
+        waiting = []
+        while True:
+            player = await self.lobby.get()
+            for session, finished in waiting:
+                if session.reader.at_eof():  # the waiting player left the lobby.
+                    finished.set_result(False)
+            waiting = [(session, finished) for session, finished in waiting if not finished.done()] + [player]
+            if len(waiting) == self.players:
+                match = asyncio.create_task(self.play_match(waiting))
+                self.matches.add(match)
+                match.add_done_callback(self.matches.discard)
+                waiting = []
+
+    # sends text to every player of a match.
+    async def broadcast(self, sessions, text: str):
+        await asyncio.gather(*(session.send(text) for session in sessions), return_exceptions=True)
+
+    # plays a match between players, following the rules of play_games.
+    async def play_match(self, players):
+        sessions = [session for session, finished in players]
+        scores = [session.score for session in sessions]
+        completed, stored, cancelled = False, False, False
+        try:
+            dice = Dice(output=self.output, rng=DiceRNG())  # every match has its own seed to be replayed from.
+            match = Match(sessions, dice, [session.score for session in sessions])
+            await self.broadcast(sessions, "\nLet the games begin! (game seed: {})".format(dice.rng.seed))
+            tie_breaker = False
+            for round_no, player, one_die in match.turns():
+                if (not one_die) and player == 0:
+                    await self.broadcast(sessions, "\n ----   Round {}   ---- ".format(str(round_no)))
+                elif one_die and not tie_breaker:  # if more than one player has the highest score.
+                    tied = len(match.leaders())
+                    await self.broadcast(sessions, "\n{} players have the same at the end of 5 rounds! "
+                                                   "A tie-breaker will commence!\n".format("Both" if tied == 2 else tied))
+                    tie_breaker = True
+                await self.take_turn(sessions, match, player, round_no, one_die)
+
+            champion, (runner_up, difference) = sessions[match.winner], match.runner_up()
+            await self.broadcast(sessions, "{0} wins with {1} more points than {2}!"
+                                 .format(champion.username, difference, sessions[runner_up].username))
+            self.match_log.append(dice.rng.seed, champion.user_id, match.round_no, MatchLog.WIN, score=champion.score)
+
+            await self.store(sessions)
+            stored = True
+            output = OutputBuffer()
+            await asyncio.to_thread(display_scores, self.db, self.top_players, output)
+            await self.broadcast(sessions, output.take().rstrip("\n"))
+            completed = True
+        except ConnectionError:
+            await self.broadcast(sessions, "\nYour opponent left the game.")
+        except Exception:
+            self.logger.exception("The match between %s failed.", ", ".join(str(session.username)
+                                                                             for session in sessions))
+            await self.broadcast(sessions, "\nThe match could not be finished.")
+        except asyncio.CancelledError:
+            cancelled = True  # the server is stopping, so the players are not sent back to the lobby.
+            raise
+        finally:
+            if not stored:
+                for session, score in zip(sessions, scores):
+                    session.score = score  # the scores of a match that was not finished are never stored.
+            for session, finished in players:
+                if not finished.done():
+                    # the players that are still connected go back to the lobby.
+                    left = session.reader.at_eof() or session.writer.is_closing()
+                    finished.set_result(completed if completed or left or cancelled else None)
+
+    # lets a player roll their dices and shows the outcome to everyone in the match.
+    async def take_turn(self, sessions, match: Match, player: int, round_no: int, one_die: bool = False):
+        session = sessions[player]
+        await self.broadcast(sessions, "\n\t\t{0}'s turn:".format(session.username))
+        await session.ask("Press enter to roll")
+        points, reset = match.turn(player, one_die)
+        session.score = match.scores[player]
+        faces = self.output.take().rstrip("\n")  # nothing else is written to the buffer until the roll is taken.
+        if reset:
+            faces += "\n{} could not gain points from this round; the sum of his/her dices is an odd!" \
+                .format(session.username)
+        elif not one_die:
+            faces += "\n{0} gained {1} points from this round, with an overall score of {2}!" \
+                .format(session.username, str(points), session.score)
+        self.match_log.turn(match.dice.rng.seed, session.user_id, round_no, match.dice.rolls, session.score, reset)
+        await self.broadcast(sessions, faces)
+
+    # hands the scores of a match to the writer and waits until they have been committed.
+    async def store(self, sessions):
+        stored = asyncio.get_running_loop().create_future()
+        await self.pending.put(({session.username: session.score for session in sessions}, stored))
+        await stored
+
+    # writes the scores of every finished match, sharing one commit between the matches that finish together.
+    async def store_writer(self):
+        while True:
+            batch = [await self.pending.get()]
+            await asyncio.sleep(self.commit_delay)
+            while not self.pending.empty():
+                batch.append(self.pending.get_nowait())
+
+            scores = {}
+            for players, stored in batch:
+                scores.update(players)
+            try:
+                # the writes wait for their commit on threads, so that the matches carry on in the meantime.
+                await asyncio.to_thread(self.match_log.flush)  # the steps are written along with their scores.
+                await asyncio.to_thread(store_scores, scores, self.db, self.top_players)
+                for players, stored in batch:
+                    if not stored.done():  # the match may have been cancelled while it waited.
+                        stored.set_result(True)
+            except Exception as error:
+                for players, stored in batch:
+                    if not stored.done():
+                        stored.set_exception(error)
+            finally:
+                for ignored in batch:
+                    self.pending.task_done()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Hosts dice game matches over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", default="Database.db")
+    parser.add_argument("--players", type=int, default=2, help="the amount of players in every match")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(GameServer(arguments.database, arguments.host, arguments.port,
+                               players=arguments.players).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+import threading
+from bisect import bisect_left, insort
+
+from Utils import SQLManager
+
+
+class Leaderboard(object):
+    """
+    Ranks every player in the Users table by their score, with ties ordered by username. Pages are found by
+    seeking past the last row of the previous page on the (Score, Username) index rather than skipping rows with
+    OFFSET, so a page deep in the ranking is as quick to fetch as the first one.
+
+    :argument manager: The SQLManager connected to the database of the players, which should already be migrated.
+
+    :argument page_size: The amount of rows in a page.
+    """
+
+    # sqlite statements of the leaderboard, every one of them ordered by the Users_Score_Username index.
+    PAGE_FIRST = "SELECT Username, Score FROM Users ORDER BY Score DESC, Username LIMIT ?"
+    PAGE_AFTER = "SELECT Username, Score FROM Users WHERE Score <= ? AND (Score < ? OR Username > ?) " \
+                 "ORDER BY Score DESC, Username LIMIT ?"
+    ROWS = "SELECT Username, Score FROM Users ORDER BY Score DESC, Username"
+    RANK = "SELECT COUNT(*) + 1 FROM Users WHERE Score > ? OR (Score == ? AND Username < ?)"
+
+    # initialises variables as an instance is made.
+    def __init__(self, manager: SQLManager, page_size: int = 10):
+        self.manager, self.page_size = manager, page_size
+
+    # returns a page of (username, score) rows, starting after the last row of the previous page.
+    def page(self, after: tuple = None, size: int = None):
+        size = self.page_size if size is None else size
+        if after is None:
+            return self.manager.select_rows(self.PAGE_FIRST, (size,))
+        username, score = after
+        return self.manager.select_rows(self.PAGE_AFTER, (score, score, username, size))
+
+    # goes through every page of the leaderboard, one page at a time.
+    def pages(self, size: int = None):
+        page = self.page(size=size)
+        while page:
+            yield page
+            page = self.page(page[-1], size) if len(page) == (self.page_size if size is None else size) else []
+
+    # goes through every row of the leaderboard, fetching a page worth of rows from sqlite at a time.
+    def rows(self, size: int = None):
+        for rows in self.manager.select_chunks(self.ROWS, size=self.page_size if size is None else size):
+            yield from rows
+
+    # returns the players with the highest scores.
+    def top(self, amount: int = 5):
+        return self.page(size=amount)
+
+    # returns the rank of a player, or None if they are not registered.
+    def rank(self, username: str):
+        row = self.manager.select_value("Users", "Username == ?", True, "Score", params=(username,))
+        if row is None:
+            return None
+        return self.manager.select_rows(self.RANK, (row[0], row[0], username))[0][0]
+
+
+class TopScores(object):
+    """
+    Keeps the players with the highest scores in memory as a sorted list, updating it as scores are written
+    instead of asking the database again. More players are kept than are usually shown, so that a player whose
+    score drops out of the list can be replaced from memory; the database is only asked again once too few
+    players are left. Scores written by anything other than update are not seen until reload is called.
+
+    :argument manager: The SQLManager connected to the database of the players.
+
+    :argument size: The amount of players with the highest scores that are kept.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, manager: SQLManager, size: int = 50):
+        self.manager, self.size = manager, size
+        self.leaderboard = Leaderboard(manager)
+        self.entries, self.scores = None, {}  # entries are (-score, username) so that they sort as the leaderboard.
+        self.complete = False  # whether every player in the table is kept.
+        self.loads = 0
+        self.lock = threading.RLock()  # scores may be stored and shown from different threads.
+
+    # loads the players with the highest scores from the database.
+    def reload(self):
+        with self.lock:
+            rows = self.leaderboard.top(self.size)
+            self.entries = [(-score, username) for username, score in rows]
+            self.scores = {username: score for username, score in rows}
+            self.complete = len(rows) < self.size
+            self.loads += 1
+
+    # records a player's new score, keeping them only if they still rank among the kept players.
+    def update(self, username: str, score: int):
+        with self.lock:
+            if self.entries is None:
+                return  # nothing is kept yet, so the score will be loaded along with the rest.
+            if username in self.scores:
+                del self.entries[bisect_left(self.entries, (-self.scores.pop(username), username))]
+
+            entry = (-score, username)
+            if self.complete or (self.entries and entry < self.entries[-1]):
+                insort(self.entries, entry)
+                self.scores[username] = score
+                if len(self.entries) > self.size:  # the lowest player is forgotten, so others may be missing.
+                    del self.scores[self.entries.pop()[1]]
+                    self.complete = False
+
+    # records the new scores of many players.
+    def update_many(self, players: dict):
+        with self.lock:
+            for username in players:
+                self.update(username, players[username])
+
+    # returns the players with the highest scores, only asking the database if too few players are kept.
+    def top(self, amount: int = 5):
+        with self.lock:
+            if (self.entries is None) or (len(self.entries) < amount and not self.complete):
+                self.reload()
+            return [(username, -score) for score, username in self.entries[:amount]]
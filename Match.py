@@ -0,0 +1,78 @@
+from array import array
+
+
+class Match(object):
+    """
+    Plays a match between any amount of players with the rules of play_games: every player takes a turn in
+    each round, and once the rounds are over the players sharing the highest score roll 1 die each until one of
+    them leads. The scores are kept in a compact array indexed by the order of the players rather than in a
+    dictionary, so the leaders of a lobby of any size are found with a single pass made by array in C.
+
+    :argument players: The players of the match in the order they take their turns, e.g. their usernames.
+
+    :argument dice: The Dice that every player rolls.
+
+    :argument scores: The scores that the players start the match with. Every player starts with 0 if this
+                      argument is not passed.
+
+    :argument rounds: The amount of rounds before the tie-breaker.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, players, dice, scores=None, rounds: int = 5):
+        self.players, self.dice, self.rounds = list(players), dice, rounds
+        if len(self.players) < 2:
+            raise ValueError("A match needs at least 2 players!")
+        self.scores = array("q", scores if scores is not None else bytes(8 * len(self.players)))
+        self.round_no, self.tie_breaks = 0, 0
+        self.winner = None  # the index of the winning player, once the match is over.
+
+    # returns the indexes of the players with the highest score, out of every player or only of those given.
+    def leaders(self, among=None):
+        if among is None:
+            best = max(self.scores)
+            if self.scores.count(best) == 1:  # the usual case is found without a loop in Python.
+                return [self.scores.index(best)]
+            among = range(len(self.scores))
+        best = max(self.scores[player] for player in among)
+        return [player for player in among if self.scores[player] == best]
+
+    # returns the player with the highest score after the winner, along with how far behind the winner they are.
+    def runner_up(self):
+        ranked = sorted(range(len(self.scores)), key=self.scores.__getitem__, reverse=True)[:2]
+        return ranked[1], self.scores[ranked[0]] - self.scores[ranked[1]]
+
+    # goes through every turn of the match as (round, player, one_die), where the turn is played by turn.
+    def turns(self):
+        for round_no in range(1, self.rounds + 1):
+            self.round_no = round_no
+            for player in range(len(self.players)):
+                yield round_no, player, False
+
+        # only the players sharing the highest score take part in each round of the tie-breaker.
+        tied = self.leaders()
+        while len(tied) > 1:
+            self.round_no += 1
+            self.tie_breaks += 1
+            for player in tied:
+                yield self.round_no, player, True
+            tied = self.leaders(tied)
+        self.winner = tied[0]
+
+    # rolls the dices for a player's turn, returning the points rolled and whether their score was reset to 0.
+    def turn(self, player: int, one_die: bool = False):
+        points = self.dice.roll(one_die)[0]
+        score = self.scores[player] + points
+        reset = (not one_die) and score < 0  # a negative score is reset to 0.
+        self.scores[player] = 0 if reset else score
+        return points, reset
+
+    # plays every turn of the match without stopping, returning the index of the winner.
+    def play(self):
+        for round_no, player, one_die in self.turns():
+            self.turn(player, one_die)
+        return self.winner
+
+    # returns the score of every player as a dictionary.
+    def results(self):
+        return dict(zip(self.players, self.scores))
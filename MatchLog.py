@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+
+class MatchLog(object):
+    """
+    Appends every step of a game to a binary file made of fixed-size records, writing the records in
+    batches instead of one at a time. Each record holds the game's seed, the time, the player's Id in the
+    Users table, the round, the kind of step, the dices involved, the points of the step and the player's
+    score after the turn.
+
+    :argument path: The location of the log file.
+
+    :argument batch_size: The amount of records that are kept before they are written to the file.
+    """
+
+    # the layout of a record: game, time, player, round, kind, die one, die two, points, score.
+    RECORD = struct.Struct("<QIIBBBBii")
+
+    # the kinds of steps that are recorded.
+    ROLL, DOUBLE, ODD, EVEN, RESET, TIE_BREAK, WIN = range(1, 8)
+    KINDS = {ROLL: "roll", DOUBLE: "double", ODD: "odd", EVEN: "even", RESET: "reset", TIE_BREAK: "tie-break",
+             WIN: "win"}
+
+    # initialises variables as an instance is made.
+    def __init__(self, path: str = "Matches.log", batch_size: int = 4096):
+        self.path, self.batch_size = path, batch_size
+        self.pending = bytearray()
+        self.lock = threading.Lock()  # a batch may be written by another thread while records are added.
+
+    # adds a record onto the batch, writing the batch once it is full.
+    def append(self, game: int, player: int, round_no: int, kind: int, die_one: int = 0, die_two: int = 0,
+               points: int = 0, score: int = 0):
+        record = self.RECORD.pack(game, int(time.time()), player, round_no, kind, die_one, die_two, points, score)
+        with self.lock:
+            self.pending += record
+            full = len(self.pending) >= self.batch_size * self.RECORD.size
+        if full:
+            self.flush()
+
+    # records the steps of a turn from the values of the dices rolled in it (see Dice.rolls).
+    def turn(self, game: int, player: int, round_no: int, rolls: list, score: int, reset: bool = False):
+        if len(rolls) == 1:
+            self.append(game, player, round_no, self.TIE_BREAK, rolls[0], 0, rolls[0], score)
+            return
+        self.append(game, player, round_no, self.ROLL, rolls[0], rolls[1], rolls[0] + rolls[1], score)
+        if len(rolls) == 3:
+            self.append(game, player, round_no, self.DOUBLE, rolls[2], 0, rolls[2], score)
+        elif sum(rolls) % 2 == 1:
+            self.append(game, player, round_no, self.ODD, 0, 0, -5, score)
+        else:
+            self.append(game, player, round_no, self.EVEN, 0, 0, 10, score)
+        if reset:
+            self.append(game, player, round_no, self.RESET, 0, 0, 0, score)
+
+    # writes every record in the batch onto the end of the file.
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, bytearray()
+        if pending:
+            with open(self.path, "ab") as file:
+                file.write(pending)
+
+    # allows a log to be used in a with statement, which writes the batch at the end.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *ignored):
+        self.flush()
+
+
+class MatchLogReader(object):
+    """
+    Reads a log written by MatchLog by memory-mapping it, so records are only read from the file as they are
+    used and are never copied into a separate buffer. A record that was only partly written is ignored.
+
+    :argument path: The location of the log file.
+    """
+
+    # the fields of a record as a NumPy structured type, laid out in the same way as MatchLog.RECORD.
+    FIELDS = [("game", "<u8"), ("time", "<u4"), ("player", "<u4"), ("round", "u1"), ("kind", "u1"),
+              ("die_one", "u1"), ("die_two", "u1"), ("points", "<i4"), ("score", "<i4")]
+
+    # initialises variables as an instance is made.
+    def __init__(self, path: str = "Matches.log"):
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.length = size // MatchLog.RECORD.size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.mapped = memoryview(self.map)
+        self.view = self.mapped[:self.length * MatchLog.RECORD.size]
+
+    # returns the amount of records in the log.
+    def __len__(self):
+        return self.length
+
+    # goes through every record in the log as a tuple laid out as MatchLog.RECORD.
+    def __iter__(self):
+        return MatchLog.RECORD.iter_unpack(self.view)
+
+    # goes through every record of a single game.
+    def game(self, game: int):
+        return (record for record in self if record[0] == game)
+
+    # returns every record as a NumPy structured array that shares its memory with the file. The array can still be
+    # used after the reader is closed, as the file is only unmapped once every such array is gone.
+    def array(self):
+        import numpy  # only imported when it is needed, as importing it takes longer than most games.
+        return numpy.frombuffer(self.view, dtype=numpy.dtype(self.FIELDS))
+
+    # returns the total points of every kind of step, e.g. how many points were lost to odd rolls.
+    def points_by_kind(self):
+        try:
+            import numpy  # adds up millions of records much faster when it is installed.
+        except ImportError:
+            numpy = None
+        if numpy is not None and self.length:
+            records = self.array()
+            counts = numpy.bincount(records["kind"])
+            sums = numpy.bincount(records["kind"], weights=records["points"])
+            return {MatchLog.KINDS.get(kind, kind): int(sums[kind]) for kind in numpy.flatnonzero(counts)}
+        totals = {}
+        for record in self:
+            kind = MatchLog.KINDS.get(record[4], record[4])
+            totals[kind] = totals.get(kind, 0) + record[7]
+        return totals
+
+    # closes the log file.
+    def close(self):
+        try:
+            self.view.release()
+            self.mapped.release()
+            if isinstance(self.map, mmap.mmap):
+                self.map.close()
+        except BufferError:
+            pass  # an array from array() still uses the mapping, which is unmapped along with the last array.
+        self.view, self.mapped, self.map, self.length = memoryview(b""), memoryview(b""), b"", 0
+        self.file.close()
+
+    # allows a reader to be used in a with statement, which closes it at the end.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *ignored):
+        self.close()
@@ -0,0 +1,86 @@
+class MigrationRunner(object):
+    """
+    Upgrades the schema of a database in place, one version at a time, recording the version that the
+    database has reached in sqlite's user_version so that every migration only ever runs once.
+
+    :argument manager: The SQLManager connected to the database that will be upgraded.
+    """
+
+    # every migration in order, as (version, description, statements).
+    MIGRATIONS = [
+        (1, "Store Score as an INTEGER and give every Username a single row", [
+            "CREATE TABLE IF NOT EXISTS Users (Username TEXT, Password TEXT, Score INTEGER)",
+            "CREATE TABLE Users_migrated (Username TEXT NOT NULL, Password TEXT NOT NULL, "
+            "Score INTEGER NOT NULL DEFAULT 0)",
+            # the first account registered with a username is the one that is kept. An account without a password
+            # is kept with an empty one, which can never be signed in with, so that its score is not lost.
+            "INSERT INTO Users_migrated (Username, Password, Score) "
+            "SELECT Username, COALESCE(Password, ''), CAST(COALESCE(Score, 0) AS INTEGER) FROM Users "
+            "WHERE rowid IN (SELECT MIN(rowid) FROM Users WHERE Username IS NOT NULL GROUP BY Username)",
+            "DROP TABLE Users",
+            "ALTER TABLE Users_migrated RENAME TO Users",
+        ]),
+        (2, "Index Username for logins and Score for the leaderboard", [
+            "CREATE UNIQUE INDEX IF NOT EXISTS Users_Username ON Users (Username)",
+            "CREATE INDEX IF NOT EXISTS Users_Score ON Users (Score DESC)",
+        ]),
+        (3, "Rate every player and keep the results of tournaments", [
+            "ALTER TABLE Users ADD COLUMN Rating REAL NOT NULL DEFAULT 1000",
+            "CREATE TABLE IF NOT EXISTS Results (Tournament INTEGER NOT NULL, Round INTEGER NOT NULL, "
+            "PlayerOne TEXT NOT NULL, PlayerTwo TEXT NOT NULL, ScoreOne INTEGER NOT NULL, ScoreTwo INTEGER NOT NULL, "
+            "Winner TEXT NOT NULL, Seed INTEGER NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS Results_Tournament ON Results (Tournament, Round)",
+        ]),
+        (4, "Index Score and Username together so that the leaderboard can seek to any page", [
+            "CREATE INDEX IF NOT EXISTS Users_Score_Username ON Users (Score DESC, Username)",
+            "DROP INDEX IF EXISTS Users_Score",
+        ]),
+        # a rowid that is not declared may be renumbered by VACUUM, which would mix up the players of the match log.
+        (5, "Give every player an Id that never changes", [
+            "CREATE TABLE Users_migrated (Id INTEGER PRIMARY KEY, Username TEXT NOT NULL, Password TEXT NOT NULL, "
+            "Score INTEGER NOT NULL DEFAULT 0, Rating REAL NOT NULL DEFAULT 1000)",
+            "INSERT INTO Users_migrated (Id, Username, Password, Score, Rating) "
+            "SELECT rowid, Username, Password, Score, Rating FROM Users",
+            "DROP TABLE Users",
+            "ALTER TABLE Users_migrated RENAME TO Users",
+            "CREATE UNIQUE INDEX Users_Username ON Users (Username)",
+            "CREATE INDEX Users_Score_Username ON Users (Score DESC, Username)",
+        ]),
+    ]
+
+    # initialises variables as an instance is made.
+    def __init__(self, manager):
+        self.manager = manager
+
+    # returns the schema version that the database is currently at.
+    def version(self):
+        self.manager.execute_statement_cursor("PRAGMA user_version")
+        return self.manager.c.fetchone()[0]
+
+    # returns the latest schema version that can be migrated to.
+    def latest(self):
+        return self.MIGRATIONS[-1][0]
+
+    # runs every migration newer than the database's version, returning the descriptions of those that ran.
+    def migrate(self, target: int = None):
+        target, applied = self.latest() if target is None else target, []
+        for version, description, statements in self.MIGRATIONS:
+            if self.version() < version <= target:
+                self.apply(version, statements)
+                applied.append(description)
+        return applied
+
+    # runs the statements of a migration in a single transaction along with its new version.
+    def apply(self, version, statements):
+        db = self.manager.db
+        with self.manager.write_lock:  # a pooled manager's writer waits until the migration is committed.
+            db.execute("BEGIN")
+            try:
+                for statement in statements:
+                    db.execute(statement)
+                db.execute("PRAGMA user_version = {}".format(int(version)))
+                db.commit()
+                self.manager.invalidate()  # results cached before the migration may no longer match the schema.
+            except BaseException:
+                db.rollback()
+                raise
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class DiceSimulator(object):
+    """
+    Plays full games of the dice game without any output, applying the same rules as Dice.roll and
+    play_games to whole batches of games at once with NumPy instead of one roll at a time.
+
+    :argument players: The amount of players in every game.
+
+    :argument rounds: The amount of rounds in every game before the tie-breaker.
+
+    :argument seed: Seeds the random generator so that simulations can be reproduced.
+    """
+
+    # the most scores (games x players) that are held in memory at once when playing large batches.
+    CHUNK_SIZE = 2000000
+
+    # initialises variables as an instance is made.
+    def __init__(self, players: int = 2, rounds: int = 5, seed: int = None):
+        if players < 1:
+            raise ValueError("A game needs at least 1 player!")
+        self.players, self.rounds = players, rounds
+        self.rng = np.random.default_rng(seed)
+
+    # returns the points of many 2-dice rolls at once, mirroring the rules of Dice.roll.
+    def roll_points(self, *shape):
+        dice = self.rng.integers(1, 7, size=shape + (3,), dtype=np.int16)
+        total = dice[..., 0] + dice[..., 1]
+        return np.where(dice[..., 0] == dice[..., 1], total + dice[..., 2],  # a double rolls an extra die.
+                        np.where(total % 2 == 1, total - 5, total + 10))  # an odd sum loses 5, an even sum gains 10.
+
+    # checks which games have more than one player sharing the highest score.
+    @staticmethod
+    def tied(scores):
+        return (scores == scores.max(axis=1, keepdims=True)).sum(axis=1) > 1
+
+    # plays a chunk of games, returning the final scores and the amount of tie-breaker rolls of each game.
+    def play_chunk(self, start_scores):
+        scores = start_scores.copy()
+        points = self.roll_points(self.rounds, *scores.shape)
+        for i in range(self.rounds):
+            scores = np.maximum(scores + points[i], 0)  # a score can never drop below zero.
+
+        # the players sharing the highest score roll 1 die each until only one of them has the highest score.
+        tie_breaks = np.zeros(len(scores), dtype=np.int32)
+        tied = np.flatnonzero(self.tied(scores))
+        while len(tied) != 0:
+            tied_scores = scores[tied]
+            leaders = tied_scores == tied_scores.max(axis=1, keepdims=True)
+            scores[tied] = tied_scores + leaders * self.rng.integers(1, 7, size=tied_scores.shape, dtype=np.int16)
+            tie_breaks[tied] += 1
+            tied = tied[self.tied(scores[tied])]
+        return scores, tie_breaks
+
+    # plays an amount of games, returning a (games x players) array of final scores and the tie-breaker lengths.
+    def play(self, games: int, start_scores=None):
+        if start_scores is None:
+            start_scores = np.zeros(self.players, dtype=np.int64)
+        start_scores = np.broadcast_to(np.asarray(start_scores, dtype=np.int64), (games, self.players))
+
+        scores = np.empty((games, self.players), dtype=np.int64)
+        tie_breaks = np.empty(games, dtype=np.int32)
+        chunk = max(1, self.CHUNK_SIZE // self.players)
+        for start in range(0, games, chunk):
+            end = min(start + chunk, games)
+            scores[start:end], tie_breaks[start:end] = self.play_chunk(start_scores[start:end])
+        return scores, tie_breaks
+
+    # returns the index of the winning player of every game.
+    @staticmethod
+    def winners(scores):
+        return scores.argmax(axis=1)
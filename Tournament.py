@@ -0,0 +1,170 @@
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil, log2
+from random import Random
+
+from DiceGame import Dice, DiceRNG
+from Match import Match
+from Migrations import MigrationRunner
+from Utils import OutputBuffer, SQLManager
+
+
+# plays a match between 2 players without any output, following the rules of play_games.
+def play_match(seed: int, rounds: int = 5):
+    output = OutputBuffer()
+    match = Match(range(2), Dice(output=output, rng=DiceRNG(seed, block_size=64)), rounds=rounds)
+    match.play()
+    output.take()
+    return list(match.scores)
+
+
+# plays many matches in a worker process, so that each worker is handed a chunk of matches at once.
+def play_matches(seeds):
+    return [play_match(seed) for seed in seeds]
+
+
+class Tournament(object):
+    """
+    Plays a tournament between players registered in the Users table, either as a round-robin where every
+    player meets every other player or as a Swiss tournament where players with similar results meet. The
+    matches of a round are played in parallel across a pool of processes, and the results of every match
+    along with the new ratings of the players are stored in a single transaction at the end.
+
+    :argument manager: The SQLManager connected to the database of the players.
+
+    :argument usernames: The players of the tournament. If this argument is not passed, the players are the
+                         first registered users, up to the limit.
+
+    :argument limit: The most players that are taken from the Users table when no usernames are passed.
+
+    :argument workers: The amount of processes that play matches. Defaults to one for every core.
+
+    :argument seed: Seeds the pairings and the matches so that a tournament can be played again.
+    """
+
+    # how far a single match can move a player's rating.
+    K_FACTOR = 32
+
+    # initialises variables as an instance is made.
+    def __init__(self, manager: SQLManager, usernames: list = None, limit: int = None, workers: int = None,
+                 seed: int = None):
+        self.manager = manager
+        MigrationRunner(manager).migrate()
+        if usernames is None:
+            manager.execute_statement_cursor("SELECT Username FROM Users ORDER BY Id LIMIT ?",
+                                             (limit if limit is not None else -1,))  # -1 has no limit.
+            usernames = [row[0] for row in manager.c.fetchall()]
+        self.players = list(usernames)
+        if len(self.players) < 2:
+            raise ValueError("A tournament needs at least 2 players!")
+        self.workers = workers or os.cpu_count() or 1
+        self.random = Random(seed)
+        self.ratings = {}
+        for i in range(0, len(self.players), 500):  # sqlite limits the amount of values bound in one statement.
+            chunk = tuple(self.players[i:i + 500])
+            self.ratings.update(manager.select_value("Users", "Username IN ({})".format(
+                manager.placeholders(len(chunk))), False, "Username", "Rating", params=chunk))
+        if len(self.ratings) != len(self.players):
+            raise ValueError("Every player of a tournament should be registered!")
+        self.points = {username: 0 for username in self.players}  # 1 point for every win or bye.
+        self.opponents = {username: set() for username in self.players}
+        self.results = []  # every match as (round, player one, player two, score one, score two, winner, seed).
+
+    # returns the pairings of every round of a round-robin, using the circle method.
+    def round_robin(self):
+        circle = self.players + ([None] if len(self.players) % 2 else [])  # None is a bye.
+        rounds = []
+        for ignored in range(len(circle) - 1):
+            half = len(circle) // 2
+            rounds.append([(circle[i], circle[-1 - i]) for i in range(half)
+                           if (circle[i] is not None) and (circle[-1 - i] is not None)])
+            circle = [circle[0], circle[-1]] + circle[1:-1]  # every player but the first moves round the circle.
+        return rounds
+
+    # returns the pairings of the next Swiss round, where players with the same points meet if they have not yet.
+    def swiss_round(self):
+        standings = sorted(self.players, key=lambda username: (-self.points[username], -self.ratings[username]))
+        if len(standings) % 2:
+            # the lowest player that has not had a bye yet sits this round out and gains a point.
+            bye = next((username for username in reversed(standings) if None not in self.opponents[username]),
+                       standings[-1])
+            standings.remove(bye)
+            self.points[bye] += 1
+            self.opponents[bye].add(None)
+
+        pairings = []
+        while standings:
+            player = standings.pop(0)
+            opponent = next((other for other in standings if other not in self.opponents[player]), standings[0])
+            standings.remove(opponent)
+            pairings.append((player, opponent))
+        return pairings
+
+    # plays every match of the rounds in parallel, then records their results in the order of the rounds.
+    def play_rounds(self, rounds, executor):
+        matches = [(round_no, one, two, self.random.getrandbits(63)) for round_no, pairings in rounds
+                   for one, two in pairings]
+        seeds = [seed for round_no, one, two, seed in matches]
+        chunk = max(1, ceil(len(seeds) / (self.workers * 4)))
+        scores = [result for results in executor.map(play_matches, [seeds[i:i + chunk] for i in
+                                                                     range(0, len(seeds), chunk)])
+                  for result in results]
+
+        for (round_no, one, two, seed), (score_one, score_two) in zip(matches, scores):
+            winner = one if score_one > score_two else two
+            self.points[winner] += 1
+            self.opponents[one].add(two)
+            self.opponents[two].add(one)
+            self.rate(one, two, winner)
+            self.results.append((round_no, one, two, score_one, score_two, winner, seed))
+
+    # moves the ratings of both players according to the outcome of their match.
+    def rate(self, one: str, two: str, winner: str):
+        expected = 1 / (1 + 10 ** ((self.ratings[two] - self.ratings[one]) / 400))
+        change = self.K_FACTOR * ((1 if winner == one else 0) - expected)
+        self.ratings[one] += change
+        self.ratings[two] -= change
+
+    # plays the whole tournament and stores it, returning the players ordered by their points.
+    def play(self, system: str = "round-robin", rounds: int = None):
+        with ProcessPoolExecutor(self.workers) as executor:
+            if system == "round-robin":  # no round depends on another, so every match is played at once.
+                self.play_rounds(enumerate(self.round_robin(), 1), executor)
+            elif system == "swiss":
+                for round_no in range(1, (rounds or ceil(log2(len(self.players)))) + 1):
+                    self.play_rounds([(round_no, self.swiss_round())], executor)
+            else:
+                raise ValueError("The tournament system should be either 'round-robin' or 'swiss'!")
+        self.store()
+        return sorted(self.players, key=lambda username: (-self.points[username], -self.ratings[username]))
+
+    # stores the results and the new ratings in a single transaction.
+    def store(self):
+        self.manager.execute_statement_cursor("SELECT COALESCE(MAX(Tournament), 0) + 1 FROM Results")
+        tournament = self.manager.c.fetchone()[0]
+        with self.manager.transaction():
+            self.manager.insert_many("Results", ["Tournament", "Round", "PlayerOne", "PlayerTwo", "ScoreOne",
+                                                 "ScoreTwo", "Winner", "Seed"],
+                                     [(tournament,) + result for result in self.results])
+            self.manager.update_many("Users", "Username == ?", ["Rating"],
+                                     [(rating, username) for username, rating in self.ratings.items()])
+        return tournament
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Plays a tournament between the registered players.")
+    parser.add_argument("--database", default="Database.db")
+    parser.add_argument("--system", choices=["round-robin", "swiss"], default="round-robin")
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+
+    db = SQLManager(arguments.database)
+    tournament = Tournament(db, limit=arguments.limit, workers=arguments.workers, seed=arguments.seed)
+    for place, username in enumerate(tournament.play(arguments.system, arguments.rounds), 1):
+        print("{0}. {1}  --  Points: {2}  --  Rating: {3:.0f}".format(
+            place, username, tournament.points[username], tournament.ratings[username]))
+    db.close()
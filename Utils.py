@@ -1,4 +1,16 @@
+import logging
+import queue
+import re
 import sqlite3 as connector
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from random import Random
+from types import SimpleNamespace
 
 
 class Util(object):
@@ -20,9 +32,56 @@ class Util(object):
         effectively in their program.
         """
         # Divides a string into a list of chunks, containing a specific amount of characters.
-        divide_string = lambda string, selection: (
-            [string[loop_no * selection: (loop_no + 1) * selection].strip() for loop_no in
-             range(Util.Math.ceil(len(string.strip()), selection) + 1)])
+        divide_string = lambda string, selection: list(Util.String.chunks(string, selection))
+
+        # Lazily divides a string or a text stream into chunks, containing a specific amount of characters.
+        @staticmethod
+        def chunks(source, selection: int, strip: bool = True):
+            if selection <= 0:
+                raise ValueError("Chunks must contain at least 1 character!")
+            if isinstance(source, str):
+                # only the current chunk is sliced, so the string itself is never copied.
+                for start in range(0, len(source), selection):
+                    yield source[start:start + selection].strip() if strip else source[start:start + selection]
+            else:
+                # a text stream is read one chunk at a time, so it is never held in memory at once.
+                chunk = source.read(selection)
+                while chunk:
+                    yield chunk.strip() if strip else chunk
+                    chunk = source.read(selection)
+
+
+class OutputBuffer(object):
+    """
+    Collects the text that would be printed so that it can be written out all at once, rather than
+    making a separate write for every line.
+
+    :argument stream: Where the text is written when flushed. If this argument is not passed, the text
+                      is written to whatever sys.stdout is at the time of flushing.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, stream=None):
+        self.stream, self.parts = stream, []
+
+    # adds text onto the buffer in the same way that print would write it.
+    def print(self, *values, sep: str = " ", end: str = "\n"):
+        self.parts.append(sep.join(str(value) for value in values) + end)
+
+    # returns the text in the buffer and empties it without writing it.
+    def take(self):
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+    # writes the text in the buffer with a single write, returning the text that was written.
+    def flush(self):
+        text = self.take()
+        if text != "":
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write(text)
+            stream.flush()
+        return text
 
 
 class Menu(object):
@@ -37,6 +96,10 @@ class Menu(object):
                      according to the length of the title.
     """
 
+    # the text of recently displayed menus, shared between every menu.
+    rendered = OrderedDict()
+    RENDER_CACHE_SIZE = 64
+
     # initialises variables as a new instance is made.
     def __init__(self, title: str = "", width: int = None, pretty_print: bool = False):
         self.menu_title, self.menu_width = title, (len(title) + 2 if (
@@ -73,38 +136,33 @@ class Menu(object):
     def get_options(self):
         return self.options
 
-    # displays the menu.
-    def display(self):
+    # displays the menu, returning the text of the menu so that it can also be shown elsewhere.
+    def display(self, printed: bool = True):
         # returns a separator for separating the title and the options.
         def separator(end="\n"):
             return "+" + (self.menu_width * "-") + "+" + end
 
-        def render(display_list: list, text_width: int):
-            rendered, length = "", len(display_list)
-            for i in range(length):
-                fmt_str = "{:<{whitespace}}|"
-                if i != length - 1:
-                    fmt_str += "\n|" + (" " * 5)  # spaces
-                rendered += fmt_str.format(display_list[i], whitespace=text_width + 1)
-            return rendered
+        # formats every line of an option, taking the lines from a list or an iterator.
+        def render(display_list, text_width: int):
+            lines = ["{:<{whitespace}}|".format(line, whitespace=text_width + 1) for line in display_list]
+            return ("\n|" + (" " * 5)).join(lines)  # spaces
 
         # returns a divided string which is then formatted into a menu pattern.
         def get_divided_content(option: str, text_width: int):
-            return render(Util.String.divide_string(option, text_width), text_width)
+            return render(Util.String.chunks(option, text_width), text_width)
 
         def get_divided_pretty(option: str, text_width: int):
             lst = option.split(" ")  # splitting the words
             length = len(lst)
-            display = []
-            index = 0
+            display, line, line_length = [], [], 0
             for i in range(length):
-                prnt = ' '.join(lst[index:i + 1])
+                # the length of the words on the line is kept as they are added rather than joined every time.
+                line_length = len(lst[i]) if not line else line_length + 1 + len(lst[i])
+                line.append(lst[i])
                 fut = lst[i + 1] if (i + 1) != length else ""
-                if len(prnt) + len(fut) >= text_width:
-                    display.append(prnt)
-                    index = i + 1
-                elif (i + 1 == length) and (len(prnt) < text_width):
-                    display.append(prnt)
+                if (line_length + len(fut) >= text_width) or (i + 1 == length):
+                    display.append(' '.join(line))
+                    line, line_length = [], 0
             return render(display, text_width)
 
         def get_longest_length():
@@ -116,15 +174,15 @@ class Menu(object):
             """
             return len(str(len(self.options)))
 
-        # If changes were made to the items in the map before/after display OR if the menu is preferred to be pretty-printed.
-        if self.is_edit or self.pretty_print:
+        # returns the full text of the menu.
+        def get_content():
             text_width = self.menu_width - (5 + get_longest_length())
-            self.content = separator() + "| {:^{display_width}} |".format(self.menu_title,
-                                                                          display_width=self.menu_width - 2) + "\n" + separator()
+            content = separator() + "| {:^{display_width}} |".format(self.menu_title,
+                                                                     display_width=self.menu_width - 2) + "\n" + separator()
 
             for (item_no, item) in self.options.items():
                 item_length = len(item)  # the amount of characters in an option.
-                self.content += "| (" + str(item_no) + ") "
+                content += "| (" + str(item_no) + ") "
 
                 if item_length > text_width:
                     """
@@ -135,22 +193,109 @@ class Menu(object):
                     sections where each string contains 14 characters.
                     """
                     if self.pretty_print:
-                        self.content += get_divided_pretty(item, text_width) + "\n"
+                        content += get_divided_pretty(item, text_width) + "\n"
                     else:
-                        self.content += get_divided_content(item, text_width) + "\n"
+                        content += get_divided_content(item, text_width) + "\n"
                 else:
-                    self.content += item.strip() + (" " * (text_width - item_length + 1)) + "|\n"
-            self.content += separator()
-            print(self.content)
-            self.is_edit = False
-        else:
+                    content += item.strip() + (" " * (text_width - item_length + 1)) + "|\n"
+            return content + separator()
+
+        # If changes were made to the items in the map before/after display.
+        if self.is_edit:
             """
-            To improve memory usage, another variable is made: is_edit. The sole purpose of this variable is to
-            signify if a change has been made to the values of the option map. If there was a change made, then
-            the value of content variable will change to give an updated view of the menu. Else, the content
-            value will be simply printed.
+            Menus with the same title, width, options and style look the same, so their text is kept in a cache
+            shared by every menu. A menu that is made again with the same options (as the menus in handle_users are)
+            will not be rendered again, whether it is pretty-printed or not.
             """
+            key = (self.menu_title, self.menu_width, tuple(self.options.items()), self.pretty_print)
+            if key in Menu.rendered:
+                Menu.rendered.move_to_end(key)
+            else:
+                Menu.rendered[key] = get_content()
+                if len(Menu.rendered) > Menu.RENDER_CACHE_SIZE:  # forgets the least recently displayed menu.
+                    Menu.rendered.popitem(last=False)
+            self.content = Menu.rendered[key]
+            self.is_edit = False
+        """
+        To improve memory usage, another variable is made: is_edit. The sole purpose of this variable is to
+        signify if a change has been made to the values of the option map. If there was a change made, then
+        the value of content variable will change to give an updated view of the menu. Else, the content
+        value will be simply printed.
+        """
+        if printed:
             print(self.content)
+        return self.content
+
+
+class QueryStats(object):
+    """
+    Collects how often every statement template runs, how long it takes and how many rows it returns, where a
+    template is a statement with its literal values replaced by '?'. A sample of the times of each template is kept
+    to work out percentiles without holding every time in memory.
+    """
+
+    # the most times that are kept for each template.
+    SAMPLES = 1024
+
+    # finds the literal values in a statement.
+    LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+    # initialises variables as an instance is made.
+    def __init__(self):
+        self.templates, self.commits = {}, 0
+        self.random = Random(0)
+
+    # converts a statement into its template.
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def template(sql: str):
+        return " ".join(QueryStats.LITERALS.sub("?", sql).split())
+
+    # records a statement along with how long it took.
+    def record(self, sql: str, elapsed: float):
+        stats = self.templates.setdefault(self.template(sql), {"count": 0, "total": 0.0, "max": 0.0, "rows": 0,
+                                                               "samples": []})
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        if len(stats["samples"]) < self.SAMPLES:
+            stats["samples"].append(elapsed)
+        else:  # every time has the same chance of being kept (reservoir sampling).
+            kept = self.random.randrange(stats["count"])
+            if kept < self.SAMPLES:
+                stats["samples"][kept] = elapsed
+
+    # records the amount of rows that a statement returned.
+    def record_rows(self, sql: str, rows: int):
+        stats = self.templates.get(self.template(sql))
+        if stats is not None:
+            stats["rows"] += rows
+
+    # returns the statistics of every template, with the slowest templates in total first.
+    def report(self):
+        # returns the time that a percentage of the samples are quicker than.
+        def percentile(samples, percent):
+            return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+        report = {}
+        for template, stats in sorted(self.templates.items(), key=lambda item: -item[1]["total"]):
+            samples = sorted(stats["samples"])
+            report[template] = {"count": stats["count"], "total": stats["total"],
+                                "mean": stats["total"] / stats["count"], "p50": percentile(samples, 50),
+                                "p95": percentile(samples, 95), "p99": percentile(samples, 99), "max": stats["max"],
+                                "rows": stats["rows"]}
+        return {"statements": report, "commits": self.commits}
+
+
+class ConnectionState(threading.local):
+    """
+    Holds the connection of a single thread to the database of a pooled SQLManager, so that every thread runs
+    its statements through a connection and cursor of its own.
+    """
+
+    connection, cursor = None, None
+    transactions = 0  # how many transactions are open, so that their writes are only committed once.
+    written = None  # the tables written to in the open transaction, which are invalidated once it commits.
 
 
 class SQLManager:
@@ -158,9 +303,32 @@ class SQLManager:
     Provides a coherently sustained connection with the sql database, providing functions that
     allow the data values or the database to be used entierly.
 
-    :argument url: The location of the database.
+    :argument url: The location of the database, which is only connected to once it is first used.
+
+    :argument cache_size: The amount of results from select_value and value_exists that are kept to be
+                          reused until their table is written to. Results are not kept if this is 0.
+
+    :argument profile: Whether every statement is timed so that stats() can tell where the time goes.
+
+    :argument slow_query: The amount of seconds after which a statement is logged as slow, even if it is not
+                          being profiled. Nothing is logged if this argument is not passed.
+
+    :argument pooled: Whether the manager can be shared between threads. Every thread reads through a connection
+                      of its own in write-ahead-log mode, so that reads never wait for writes, while writes made
+                      outside of a transaction are handed to a single writer thread that commits every write
+                      waiting for it at once.
+
+    :argument synchronous: The synchronous pragma of every connection, e.g. "NORMAL" or "FULL". Pooled managers
+                           default to "NORMAL", which is safe in write-ahead-log mode.
+
+    :argument page_cache: The amount of KiB of pages that sqlite keeps in memory for every connection.
+
+    :argument commit_delay: The amount of seconds the writer waits for other writes to share a commit.
     """
 
+    # where slow statements are logged.
+    logger = logging.getLogger("SQLManager")
+
     # sqlite statements that will be used and modified accordingly.
     TABLE_CREATE = "CREATE TABLE IF NOT EXISTS {} ({})"
     VALUE_INSERT = "INSERT INTO {} ({}) VALUES ({})"
@@ -168,11 +336,36 @@ class SQLManager:
     VALUE_SELECT = "SELECT {} FROM {}"
     VALUE_SELECT_EXISTS = "SELECT EXISTS(SELECT 1 FROM {} WHERE {})"
 
+    # the amount of parsed statements sqlite keeps for reuse.
+    CACHED_STATEMENTS = 256
+
+    # the amount of seconds a connection waits for another connection to finish writing.
+    BUSY_TIMEOUT = 30
+
+    # the statements that only read, which a pooled manager runs on the connection of the current thread.
+    READS = ("SELECT", "PRAGMA", "EXPLAIN", "WITH")
+
+    # finds the table that a statement writes to.
+    WRITTEN_TABLE = re.compile(r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|"
+                               r"DELETE\s+FROM)\s+([^\s(]+)", re.IGNORECASE)
+
     # initialises variables as an instance is made.
-    def __init__(self, url):
-        self.db = connector.connect(url)
-        self.c = self.db.cursor()
-        self.toFormat = ""
+    def __init__(self, url, cache_size: int = 0, profile: bool = False, slow_query: float = None,
+                 pooled: bool = False, synchronous: str = None, page_cache: int = None, commit_delay: float = 0.0):
+        self.url, self.pooled = url, pooled
+        self.synchronous = "NORMAL" if (synchronous is None) and pooled else synchronous
+        self.page_cache, self.commit_delay = page_cache, commit_delay
+        self.state = ConnectionState() if pooled else SimpleNamespace(connection=None, cursor=None, transactions=0)
+        self.connections = []  # every connection that was opened, so that they can all be closed.
+        self.lock = threading.RLock()  # guards the results and statistics shared between threads.
+        self.write_lock = threading.RLock()  # held by whichever thread is writing to the database.
+        self.writes, self.writer = None, None
+        self.cache_size, self.cache, self.cached_tables = cache_size, OrderedDict(), {}
+        self.hits, self.misses = 0, 0
+        self.generation = 0  # counts invalidations, so a result queried during a write is not kept.
+        self.query_stats = QueryStats() if profile else None
+        self.profilers = [self.query_stats] if profile else []  # every QueryStats that statements are recorded in.
+        self.slow_query, self.slow_queries = slow_query, deque(maxlen=100)
 
     # converts an array into string.
     def ats(self, array, quotation_marks=False):
@@ -184,47 +377,366 @@ class SQLManager:
     def dts(self, data):
         return ''.join([field + " = " + value + ("," if i+1 != len(data.items()) else "") for i, (field, value) in enumerate(data.items())])
 
-    # closes the connection of the database.
+    # returns a placeholder for every value so that sqlite binds the values instead of parsing them.
+    def placeholders(self, amount):
+        return ", ".join("?" * amount)
+
+    # converts the fields into 'field = ?' pairs for the values that will be bound in an update.
+    def assignments(self, fields):
+        return self.dts({field: "?" for field in fields})
+
+    # converts a table name into the name its cached results are kept under.
+    def table_key(self, tblName):
+        return tblName.strip("\"'`[]").lower()
+
+    # returns a cached result, running the query and keeping its result if it was not cached.
+    def cached(self, tblName, key, query):
+        if self.cache_size <= 0:
+            return query()
+        key = (self.table_key(tblName),) + key
+        with self.lock:
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            self.misses += 1
+            generation = self.generation
+
+        result = query()  # queried without the lock, so that threads can read at the same time.
+        with self.lock:
+            if generation != self.generation:  # the table may have been written to while it was queried.
+                return result
+            self.cache[key] = result
+            self.cached_tables.setdefault(key[0], set()).add(key)
+            if len(self.cache) > self.cache_size:  # forgets the least recently used result.
+                oldest = self.cache.popitem(last=False)[0]
+                self.cached_tables[oldest[0]].discard(oldest)
+        return result
+
+    # forgets the cached results of a table, or of every table if no table is given.
+    def invalidate(self, tblName=None):
+        with self.lock:
+            self.generation += 1
+            if tblName is None:
+                self.cache.clear()
+                self.cached_tables.clear()
+            else:
+                for key in self.cached_tables.pop(self.table_key(tblName), ()):
+                    self.cache.pop(key, None)
+
+    # forgets the cached results that a statement may change.
+    def invalidate_statement(self, sql):
+        if self.cache_size > 0 and not sql.lstrip().upper().startswith(self.READS):
+            written = self.WRITTEN_TABLE.match(sql)
+            table = written.group(1) if written else None
+            self.invalidate(table)
+            if self.transactions:  # other connections still read the old rows until the transaction commits.
+                self.state.written.add(table)
+
+    # returns the cache's size along with how often a result was reused or queried.
+    def cache_stats(self):
+        return {"size": len(self.cache), "max_size": self.cache_size, "hits": self.hits, "misses": self.misses}
+
+    # records how long a statement took since it started, logging it if it was slow.
+    def record(self, sql, start: float, params=()):
+        if self.profilers or (self.slow_query is not None):
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                for stats in self.profilers:
+                    stats.record(sql, elapsed)
+                if (self.slow_query is not None) and (elapsed >= self.slow_query):
+                    self.slow_queries.append((sql, params, elapsed))
+                    self.logger.warning("Slow statement (%.4fs): %s", elapsed, sql)
+
+    # records the amount of rows that a statement returned or changed.
+    def record_rows(self, sql, rows: int):
+        if self.profilers:
+            with self.lock:
+                for stats in self.profilers:
+                    stats.record_rows(sql, rows)
+
+    # counts a commit in every statistics that is being recorded.
+    def record_commit(self):
+        if self.profilers:
+            with self.lock:
+                for stats in self.profilers:
+                    stats.commits += 1
+
+    # commits the current transaction, counting the commit.
+    def commit(self):
+        self.db.commit()
+        self.record_commit()
+
+    # returns the statistics of every statement since the manager was made with profile set.
+    def stats(self):
+        return (self.query_stats or QueryStats()).report()
+
+    # records the statistics of only the statements run inside a with statement, e.g.
+    # with db.profiled() as stats: ... followed by stats.report().
+    @contextmanager
+    def profiled(self):
+        stats = QueryStats()
+        with self.lock:
+            self.profilers.append(stats)
+        try:
+            yield stats
+        finally:
+            with self.lock:
+                self.profilers.remove(stats)
+
+    # opens a new connection to the database with the pragmas of the manager.
+    def open(self):
+        connection = connector.connect(self.url, timeout=self.BUSY_TIMEOUT, cached_statements=self.CACHED_STATEMENTS,
+                                       check_same_thread=not self.pooled)  # any thread may close a pooled one.
+        if self.pooled:
+            connection.execute("PRAGMA journal_mode = WAL")
+        if self.synchronous is not None:
+            connection.execute("PRAGMA synchronous = {}".format(self.synchronous))
+        if self.page_cache is not None:
+            connection.execute("PRAGMA cache_size = {}".format(-int(self.page_cache)))  # negative sizes are KiB.
+        with self.lock:
+            self.connections.append(connection)
+        return connection
+
+    # connects to the database, which is left until the connection is first used so that making a manager is free.
+    def connect(self):
+        if self.state.connection is None:
+            self.state.connection = self.open()
+            self.state.cursor = self.state.connection.cursor()
+        return self.state.connection
+
+    # the connection of the database, which is the current thread's own connection if the manager is pooled.
+    @property
+    def db(self):
+        return self.state.connection if self.state.connection is not None else self.connect()
+
+    # the cursor shared by the statements of the manager, or of the current thread if the manager is pooled.
+    @property
+    def c(self):
+        if self.state.connection is None:
+            self.connect()
+        return self.state.cursor
+
+    # the amount of transactions that are open in the current thread.
+    @property
+    def transactions(self):
+        return self.state.transactions
+
+    # closes every connection of the database once the writer has committed every write handed to it.
     def close(self):
-        self.db.close()
+        if self.writer is not None:
+            self.writes.put(None)
+            self.writer.join()
+            self.writes, self.writer = None, None
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+        self.state = ConnectionState() if self.pooled else SimpleNamespace(connection=None, cursor=None,
+                                                                           transactions=0)
+
+    # hands a write to the writer thread and waits until it has been committed, returning its cursor's rowcount.
+    def write(self, sql, params, many: bool = False):
+        with self.lock:
+            if self.writer is None:
+                self.writes = queue.SimpleQueue()
+                self.writer = threading.Thread(target=self.write_batches, name="SQLManager writer", daemon=True)
+                self.writer.start()
+        done = Future()
+        self.writes.put((sql, params, many, done))
+        return done.result()
+
+    # runs on the writer thread, committing every write that is waiting at once until the manager is closed.
+    def write_batches(self):
+        connection = self.open()
+        connection.isolation_level = None  # the writer begins and commits its transactions itself.
+        while True:
+            batch = [self.writes.get()]
+            if batch[0] is None:
+                break
+            if self.commit_delay:
+                time.sleep(self.commit_delay)
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+            stop = batch[-1] is None
+            self.write_batch(connection, [write for write in batch if write is not None])
+            if stop:
+                break
+
+    # writes a batch in a single transaction, where a write that fails is rolled back without the others.
+    def write_batch(self, connection, batch):
+        done = []
+        with self.write_lock:
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                for sql, params, many, future in batch:
+                    connection.execute("SAVEPOINT write")
+                    try:
+                        cursor = connection.executemany(sql, params) if many else connection.execute(sql, params)
+                        connection.execute("RELEASE write")
+                        done.append((future, cursor.rowcount))
+                    except Exception as error:
+                        connection.execute("ROLLBACK TO write")
+                        connection.execute("RELEASE write")
+                        future.set_exception(error)
+                connection.execute("COMMIT")
+                self.record_commit()
+            except Exception as error:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                for sql, params, many, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+        for future, rowcount in done:
+            future.set_result(rowcount)
 
     # executes an sql statement from the database variable.
-    def execute_statement(self, sql):
-        self.db.execute(sql)
-        self.db.commit()
-
-    # executes an sql statement from the cursor.
-    def execute_statement_cursor(self, sql):
-        self.c.execute(sql)
+    def execute_statement(self, sql, params=()):
+        start = time.perf_counter()
+        if self.pooled and not self.transactions:
+            self.write(sql, params)
+        else:
+            self.db.execute(sql, params)
+            if not self.transactions:
+                self.commit()
+        self.record(sql, start, params)
+        self.invalidate_statement(sql)
+
+    # executes an sql statement for every set of values in a single transaction.
+    def execute_many(self, sql, rows):
+        start = time.perf_counter()
+        try:
+            if self.transactions:
+                rowcount = self.db.executemany(sql, rows).rowcount
+            elif self.pooled:
+                rowcount = self.write(sql, rows, many=True)
+            else:
+                with self.db:  # commits once after every row is written, or rolls back if one fails.
+                    rowcount = self.db.executemany(sql, rows).rowcount
+                self.record_commit()
+            self.record(sql, start)
+            self.record_rows(sql, rowcount)
+        finally:
+            self.invalidate_statement(sql)
+
+    # commits every write made inside a with statement at once, or rolls every write back if one fails. The
+    # transaction of a pooled manager holds the writer until it is committed.
+    @contextmanager
+    def transaction(self):
+        if self.pooled and not self.transactions:
+            with self.write_lock:
+                with self.transaction_body():
+                    yield self
+        else:
+            with self.transaction_body():
+                yield self
+
+    # counts the transactions that are open, committing or rolling back once the outermost transaction ends.
+    @contextmanager
+    def transaction_body(self):
+        if not self.transactions:
+            self.state.written = set()
+        self.state.transactions += 1
+        try:
+            yield self
+        except BaseException:
+            if self.transactions == 1:
+                self.db.rollback()
+                self.invalidate()
+            raise
+        else:
+            if self.transactions == 1:
+                self.commit()
+                # results read by other threads before the commit may have been cached after the writes.
+                for table in ({None} if None in self.state.written else self.state.written):
+                    self.invalidate(table)
+        finally:
+            self.state.transactions -= 1
+
+    # executes an sql statement from the cursor. A pooled manager hands statements that write to the writer
+    # unless they are made inside a transaction, as they would otherwise hold sqlite's lock until a commit.
+    def execute_statement_cursor(self, sql, params=()):
+        start = time.perf_counter()
+        if self.pooled and (not self.transactions) and not sql.lstrip().upper().startswith(self.READS):
+            self.write(sql, params)
+        else:
+            self.c.execute(sql, params)
+        self.record(sql, start, params)
+        self.invalidate_statement(sql)
 
     # creates a table
     def create_table(self, tblName, *fields):
-        self.toFormat = self.TABLE_CREATE
-        self.execute_statement_cursor(self.toFormat.format(tblName, self.ats(fields)))
+        self.execute_statement_cursor(self.TABLE_CREATE.format(tblName, self.ats(fields)))
 
     # inserts a value into the table.
     def insert_value(self, tblName, **fav):
-        self.toFormat = self.VALUE_INSERT.format(tblName, self.ats(fav.keys(), False), self.ats(fav.values(), True))
-        self.execute_statement(self.toFormat)
+        sql = self.VALUE_INSERT.format(tblName, self.ats(fav.keys()), self.placeholders(len(fav)))
+        self.execute_statement(sql, tuple(fav.values()))
+
+    # inserts many values into the table, where every row holds a value for each field.
+    def insert_many(self, tblName, fields, rows):
+        self.execute_many(self.VALUE_INSERT.format(tblName, self.ats(fields), self.placeholders(len(fields))), rows)
 
     # updates a value from a field in the table.
-    def update_value(self, tblName, condition, **fav):
-        self.toFormat = self.VALUE_UPDATE + ("WHERE {}" if condition != "" else "")
-        self.execute_statement(self.VALUE_UPDATE.format(tblName, self.dts(fav), condition))
+    def update_value(self, tblName, condition, params=(), **fav):
+        sql = self.VALUE_UPDATE.format(tblName, self.assignments(fav.keys()), condition)
+        self.execute_statement(sql, tuple(fav.values()) + tuple(params))
+
+    # updates many values in the table, where every row holds the new values followed by the condition's values.
+    def update_many(self, tblName, condition, fields, rows):
+        self.execute_many(self.VALUE_UPDATE.format(tblName, self.assignments(fields), condition), rows)
 
     # selects a value(s) from the table.
-    def select_value(self, tblName, condition="", one_record=False, *fields):
-        self.toFormat = self.VALUE_SELECT
-        self.toFormat = self.toFormat.format(
+    def select_value(self, tblName, condition="", one_record=False, *fields, params=()):
+        sql = (self.VALUE_SELECT + (" WHERE {}" if condition != "" else "")).format(
             self.ats(fields) if ((fields is not None) and (self.ats(fields) != "")) else "*", tblName, condition)
-        self.execute_statement_cursor(self.toFormat)
-        if one_record:
-            return self.c.fetchone()
-        else:
-            return self.c.fetchall()
+
+        # runs the query for the cache.
+        def query():
+            start = time.perf_counter()
+            cursor = self.c
+            cursor.execute(sql, params)
+            rows = cursor.fetchone() if one_record else cursor.fetchall()
+            self.record(sql, start, params)  # sqlite finds the rows as they are fetched, so fetching is timed too.
+            self.record_rows(sql, (1 if rows is not None else 0) if one_record else len(rows))
+            return rows
+
+        result = self.cached(tblName, (sql, tuple(params)), query)
+        return list(result) if isinstance(result, list) else result
 
     # checks if a value exists in the table.
-    def value_exists(self, tblName, condition):
-        self.toFormat = self.VALUE_SELECT_EXISTS.format(tblName, condition)
-        self.execute_statement_cursor(self.toFormat)
-        return self.c.fetchone()[0] == 1
+    def value_exists(self, tblName, condition, params=()):
+        sql = self.VALUE_SELECT_EXISTS.format(tblName, condition)
+
+        # runs the query for the cache.
+        def query():
+            start = time.perf_counter()
+            cursor = self.c
+            cursor.execute(sql, params)
+            exists = cursor.fetchone()[0] == 1
+            self.record(sql, start, params)
+            self.record_rows(sql, 1)
+            return exists
+
+        return self.cached(tblName, (sql, tuple(params)), query)
+
+    # returns every row of a query run on a cursor of its own, so that other queries can run in between.
+    def select_rows(self, sql, params=()):
+        start = time.perf_counter()
+        rows = self.db.execute(sql, params).fetchall()
+        self.record(sql, start, params)
+        self.record_rows(sql, len(rows))
+        return rows
+
+    # goes through the rows of a query run on a cursor of its own, fetching a chunk of rows at a time.
+    def select_chunks(self, sql, params=(), size: int = 1000):
+        start, count = time.perf_counter(), 0
+        cursor = self.db.execute(sql, params)
+        rows = cursor.fetchmany(size)
+        self.record(sql, start, params)  # only the first chunk is timed, as the rest are fetched as they are used.
+        while rows:
+            count += len(rows)
+            yield rows
+            rows = cursor.fetchmany(size)
+        self.record_rows(sql, count)
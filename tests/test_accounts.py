@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Accounts import Accounts
+from Utils import SQLManager
+
+
+class AccountsTest(unittest.TestCase):
+    # every test has a database and files of its own in a temporary folder.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = SQLManager(os.path.join(self.directory, "Test.db"))
+        self.accounts = Accounts(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+
+    # writes a file to import in the temporary folder.
+    def write(self, name: str, text: str, encoding: str = "utf-8"):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", newline="", encoding=encoding) as file:
+            file.write(text)
+        return path
+
+    # returns every account in the database.
+    def users(self):
+        return self.db.select_value("Users", "", False, "Username", "Password", "Score")
+
+    # accounts are exported and imported again without changing.
+    def test_round_trip(self):
+        self.db.insert_many("Users", Accounts.FIELDS, [("alice", "pass#1", 10), ("bobby", "pass#2", 0)])
+        for file_format in ("csv", "jsonl"):
+            path = os.path.join(self.directory, "Accounts." + file_format)
+            self.assertEqual(self.accounts.export_file(path), 2)
+            self.assertEqual(self.accounts.import_file(path), 2)
+            self.assertEqual(self.accounts.rejected, [])
+        self.assertEqual(self.users(), [("alice", "pass#1", 10), ("bobby", "pass#2", 0)])
+
+    # a score that is not a whole number is rejected rather than truncated.
+    def test_rejects_scores_that_are_not_whole_numbers(self):
+        path = self.write("Accounts.jsonl", "".join(json.dumps(record) + "\n" for record in [
+            {"Username": "alice", "Password": "pass#1", "Score": 5.9},
+            {"Username": "bobby", "Password": "pass#2", "Score": True},
+            {"Username": "carol", "Password": "pass#3", "Score": "7"},
+            {"Username": "david", "Password": "pass#4"}]))
+        self.assertEqual(self.accounts.import_file(path), 2)
+        self.assertEqual([(line_no, username) for line_no, username, problem in self.accounts.rejected],
+                         [(1, "alice"), (2, "bobby")])
+        path = self.write("Accounts.csv", "Username,Password,Score\nerin1,pass#5,5.9\nfrank,pass#6,\n")
+        self.assertEqual(self.accounts.import_file(path), 1)
+        self.assertEqual([(line_no, username) for line_no, username, problem in self.accounts.rejected],
+                         [(2, "erin1")])
+        self.assertEqual(self.users(), [("carol", "pass#3", 7), ("david", "pass#4", 0), ("frank", "pass#6", 0)])
+
+    # a file saved with a byte order mark still has its Username column.
+    def test_imports_csv_with_byte_order_mark(self):
+        path = self.write("Accounts.csv", "Username,Password,Score\nalice,pass#1,3\n", encoding="utf-8-sig")
+        self.assertEqual(self.accounts.import_file(path), 1)
+        self.assertEqual(self.users(), [("alice", "pass#1", 3)])
+
+    # a missing header or column is reported as such, rather than as an invalid username or password.
+    def test_reports_missing_columns(self):
+        path = self.write("Accounts.csv", "alice,pass#1,3\nbobby,pass#2,4\n")
+        self.assertEqual(self.accounts.import_file(path), 0)
+        self.assertEqual(self.accounts.rejected,
+                         [(1, None, "The header of the file has no Username or Password column!")])
+        path = self.write("Accounts.jsonl", json.dumps({"Username": "alice", "Score": 3}) + "\n[1, 2]\n")
+        self.assertEqual(self.accounts.import_file(path), 0)
+        self.assertEqual(self.accounts.rejected, [(1, "alice", "The account has no Password!"),
+                                                  (2, None, "The line is not a valid account!")])
+        self.assertEqual(self.users(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
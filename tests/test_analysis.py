@@ -0,0 +1,44 @@
+import unittest
+from fractions import Fraction
+
+from Analysis import ScoreDistribution
+from Simulation import DiceSimulator
+
+
+class ScoreDistributionTest(unittest.TestCase):
+    # the same distribution is shared by every test, since its probabilities are only worked out once.
+    @classmethod
+    def setUpClass(cls):
+        cls.distribution = ScoreDistribution()
+
+    # every roll has some amount of points.
+    def test_roll_distribution_sums_to_one(self):
+        self.assertEqual(sum(self.distribution.roll_distribution().values()), 1)
+        self.assertEqual(sum(self.distribution.after().values()), 1)
+
+    # neither player has the upper hand when they start with the same score.
+    def test_win_is_even_for_equal_starts(self):
+        self.assertEqual(self.distribution.win(), 0.5)
+        self.assertEqual(self.distribution.win(10, 10), 0.5)
+        self.assertGreater(self.distribution.win(10, 0), 0.5)
+
+    # the exact results agree with a seeded simulation of many games.
+    def test_agrees_with_simulation(self):
+        games = 200000
+        scores, tie_breaks = DiceSimulator(players=1, seed=1).play(games, [10])  # 1 player never ties.
+        self.assertAlmostEqual(scores.mean(), float(self.distribution.expected(start=10)), delta=0.25)
+        scores, tie_breaks = DiceSimulator(players=2, seed=1).play(games)
+        self.assertAlmostEqual((tie_breaks > 0).mean(), float(self.distribution.tie()), delta=0.002)
+        self.assertAlmostEqual(tie_breaks.mean(), float(self.distribution.expected_tie_breaks()), delta=0.002)
+        self.assertAlmostEqual(scores.mean(), float(self.distribution.expected_final()), delta=0.25)
+
+    # without any rounds every game is a tie-breaker, so the final score is only made of tie-breaker rolls.
+    def test_expected_final_includes_tie_breaker(self):
+        distribution = ScoreDistribution(rounds=0)
+        self.assertEqual(distribution.expected_final(), Fraction(7, 2) * Fraction(6, 5))
+        scores, tie_breaks = DiceSimulator(players=2, rounds=0, seed=1).play(200000)
+        self.assertAlmostEqual(scores.mean(), float(distribution.expected_final()), delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Leaderboard import Leaderboard, TopScores
+from Migrations import MigrationRunner
+from Utils import SQLManager
+
+
+class TopScoresTest(unittest.TestCase):
+    # every test has a database of its own in a temporary folder.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = SQLManager(os.path.join(self.directory, "Test.db"))
+        MigrationRunner(self.db).migrate()
+        self.leaderboard = Leaderboard(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+
+    # registers players with their scores.
+    def register(self, players: dict):
+        self.db.insert_many("Users", ["Username", "Password", "Score"],
+                            [(username, "pass#1", score) for username, score in players.items()])
+
+    # writes a player's score to the database and to the kept players, as store_scores does.
+    def store(self, top_scores: TopScores, username: str, score: int):
+        self.db.update_value("Users", "Username == ?", (username,), Score=score)
+        top_scores.update(username, score)
+
+    # a kept player whose score drops below the cutoff is forgotten, and the rest are loaded again once needed.
+    def test_drops_below_cutoff_and_refills(self):
+        self.register({"alice": 50, "bobby": 40, "carol": 30, "david": 20, "erin1": 10})
+        top_scores = TopScores(self.db, size=3)
+        self.assertEqual(top_scores.top(3), [("alice", 50), ("bobby", 40), ("carol", 30)])
+        self.store(top_scores, "alice", 5)
+        self.assertNotIn("alice", top_scores.scores)
+        self.assertEqual(top_scores.top(2), [("bobby", 40), ("carol", 30)])
+        self.assertEqual(top_scores.loads, 1)  # enough players are still kept for 2 of them.
+        self.assertEqual(top_scores.top(3), [("bobby", 40), ("carol", 30), ("david", 20)])
+        self.assertEqual(top_scores.loads, 2)
+
+    # a new score above the cutoff pushes the lowest kept player out, without asking the database.
+    def test_pushes_out_lowest_player(self):
+        self.register({"alice": 50, "bobby": 40, "carol": 30, "david": 20})
+        top_scores = TopScores(self.db, size=3)
+        top_scores.top(3)
+        self.store(top_scores, "david", 45)
+        self.assertEqual(top_scores.top(3), [("alice", 50), ("david", 45), ("bobby", 40)])
+        self.assertEqual(top_scores.loads, 1)
+        self.assertNotIn("carol", top_scores.scores)
+
+    # every player is kept while there are fewer players than the size, so any new score is kept.
+    def test_complete_keeps_every_player(self):
+        self.register({"alice": 50, "bobby": 40})
+        top_scores = TopScores(self.db, size=3)
+        top_scores.top(3)
+        self.assertTrue(top_scores.complete)
+        self.register({"carol": 0})
+        top_scores.update("carol", 0)
+        self.assertEqual(top_scores.top(3), [("alice", 50), ("bobby", 40), ("carol", 0)])
+        self.assertTrue(top_scores.complete)
+        self.register({"david": 45})
+        top_scores.update("david", 45)
+        self.assertFalse(top_scores.complete)  # carol was forgotten, so not every player is kept any more.
+        self.assertEqual(top_scores.top(3), [("alice", 50), ("david", 45), ("bobby", 40)])
+        self.assertEqual(top_scores.loads, 1)
+
+    # the kept players always match the leaderboard in the database, however the scores change.
+    def test_random_updates_match_database(self):
+        rng = random.Random(1)
+        players = {"player{}".format(i): rng.randrange(100) for i in range(30)}
+        self.register(players)
+        top_scores = TopScores(self.db, size=10)
+        for i in range(500):
+            self.store(top_scores, rng.choice(list(players)), rng.randrange(100))
+            amount = rng.randint(1, 10)
+            self.assertEqual(top_scores.top(amount), self.leaderboard.top(amount))
+        self.assertLess(top_scores.loads, 100)  # most updates are kept up with in memory.
+
+
+if __name__ == "__main__":
+    unittest.main()
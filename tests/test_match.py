@@ -0,0 +1,70 @@
+import unittest
+
+from DiceGame import Dice, DiceRNG
+from Match import Match
+from Utils import OutputBuffer
+
+
+class ScriptedDice(object):
+    """
+    Gives the points of every roll in the order they are listed, in place of Dice.
+    """
+
+    # initialises variables as an instance is made.
+    def __init__(self, *points):
+        self.points = iter(points)
+
+    # returns the next points in the same shape as Dice.roll.
+    def roll(self, one_die: bool = False):
+        return next(self.points), False
+
+
+class MatchTest(unittest.TestCase):
+    # plays every turn of a match, returning the turns in the order they were taken.
+    def play(self, match: Match):
+        turns = []
+        for turn in match.turns():
+            turns.append(turn)
+            match.turn(turn[1], turn[2])
+        return turns
+
+    # only the 2 players sharing the highest score take part in the tie-breaker of a 3 player match.
+    def test_only_tied_leaders_roll_in_tie_breaker(self):
+        match = Match(["alice", "bobby", "carol"], ScriptedDice(10, 10, 4, 3, 3, 2, 5), rounds=1)
+        self.assertEqual(self.play(match), [(1, 0, False), (1, 1, False), (1, 2, False),
+                                            (2, 0, True), (2, 1, True), (3, 0, True), (3, 1, True)])
+        self.assertEqual(match.tie_breaks, 2)
+        self.assertEqual(match.winner, 1)
+        self.assertEqual(match.runner_up(), (0, 3))
+        self.assertEqual(match.results(), {"alice": 15, "bobby": 18, "carol": 4})
+
+    # the winner and runner-up of a larger match are found from any starting scores.
+    def test_winner_and_runner_up(self):
+        match = Match(["alice", "bobby", "carol", "david"], ScriptedDice(3, 20, 1, 9), scores=[5, 0, 7, 0], rounds=1)
+        self.assertEqual(match.play(), 1)
+        self.assertEqual(match.tie_breaks, 0)
+        self.assertEqual(match.runner_up(), (3, 11))
+        self.assertEqual(list(match.scores), [8, 20, 8, 9])
+
+    # a turn that would leave a negative score resets it to 0 instead.
+    def test_score_is_clamped_at_zero(self):
+        match = Match(["alice", "bobby"], ScriptedDice(-3, 4, 6, -3), scores=[2, 0], rounds=2)
+        self.assertEqual(match.turn(0), (-3, True))
+        self.assertEqual(match.scores[0], 0)
+        self.assertEqual(match.turn(1), (4, False))
+        self.assertEqual(match.turn(0), (6, False))
+        self.assertEqual(match.turn(1), (-3, False))
+        self.assertEqual(list(match.scores), [6, 1])
+
+    # a match played again from its seed has the same turns and results.
+    def test_seed_replays_match(self):
+        for use_numpy in (True, False):
+            dices = [Dice(output=OutputBuffer(), rng=DiceRNG(42, use_numpy=use_numpy)) for ignored in range(2)]
+            matches = [Match(["alice", "bobby", "carol"], dice) for dice in dices]
+            self.assertEqual(self.play(matches[0]), self.play(matches[1]))
+            self.assertEqual(matches[0].results(), matches[1].results())
+            self.assertEqual(matches[0].winner, matches[1].winner)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+
+from MatchLog import MatchLog, MatchLogReader
+
+
+class MatchLogTest(unittest.TestCase):
+    # every test has a log of its own in a temporary folder.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "Matches.log")
+        with MatchLog(self.path, batch_size=2) as log:
+            log.turn(7, 1, 1, [3, 4], 2)
+            log.turn(7, 2, 1, [5, 5, 6], 16)
+            log.turn(8, 1, 6, [2], 4)
+            log.append(7, 2, 5, MatchLog.WIN, score=16)
+
+    def tearDown(self):
+        gc.collect()
+        shutil.rmtree(self.directory)
+
+    def test_records_are_read_back(self):
+        with MatchLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 6)
+            self.assertEqual([record[4] for record in reader.game(7)],
+                             [MatchLog.ROLL, MatchLog.ODD, MatchLog.ROLL, MatchLog.DOUBLE, MatchLog.WIN])
+            self.assertEqual(reader.points_by_kind(), {"roll": 17, "odd": -5, "double": 6, "tie-break": 2,
+                                                       "win": 0})
+
+    def test_array_outlives_the_reader(self):
+        with MatchLogReader(self.path) as reader:
+            records = reader.array()
+        self.assertEqual(records["points"].tolist(), [7, -5, 10, 6, 2, 0])
+        self.assertEqual(records["player"].tolist(), [1, 1, 2, 2, 1, 2])
+
+        reader = MatchLogReader(self.path)
+        records = reader.array()
+        reader.close()
+        self.assertEqual(len(reader), 0)
+        self.assertEqual(int(records["score"][-1]), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
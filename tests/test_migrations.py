@@ -0,0 +1,78 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from Migrations import MigrationRunner
+from Utils import SQLManager
+
+
+class MigrationRunnerTest(unittest.TestCase):
+    # every test has a database of its own in a temporary folder.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "Test.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # makes a database laid out as the game made it before it was migrated.
+    def legacy_database(self, rows):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE Users (Username TEXT, Password TEXT, Score TEXT)")
+        connection.executemany("INSERT INTO Users VALUES (?, ?, ?)", rows)
+        connection.commit()
+        connection.close()
+
+    def test_migrates_a_legacy_database(self):
+        self.legacy_database([("alice", "pass#1", "10"), ("alice", "other#2", "99"), ("bob", None, None),
+                              (None, "pass#1", "5")])
+        db = SQLManager(self.path)
+        runner = MigrationRunner(db)
+        self.assertEqual(len(runner.migrate()), len(MigrationRunner.MIGRATIONS))
+        self.assertEqual(runner.version(), runner.latest())
+        self.assertEqual(db.select_value("Users", "", False, "Username", "Password", "Score"),
+                         [("alice", "pass#1", 10), ("bob", "", 0)])
+        with self.assertRaises(sqlite3.IntegrityError):  # every username has a single account.
+            db.insert_value("Users", Username="alice", Password="pass#1", Score=0)
+        db.close()
+
+    def test_migrations_only_run_once(self):
+        db = SQLManager(self.path)
+        runner = MigrationRunner(db)
+        runner.migrate(2)
+        self.assertEqual(runner.version(), 2)
+        self.assertEqual(len(runner.migrate()), len(MigrationRunner.MIGRATIONS) - 2)
+        self.assertEqual(runner.migrate(), [])
+        db.close()
+
+    # the Id of a player is the rowid they had before the migration, and is not renumbered by VACUUM.
+    def test_ids_are_stable(self):
+        db = SQLManager(self.path)
+        runner = MigrationRunner(db)
+        runner.migrate(4)
+        for username in ("alice", "bobby", "carol"):
+            db.insert_value("Users", Username=username, Password="pass#1", Score=0)
+        db.execute_statement("DELETE FROM Users WHERE Username == ?", ("alice",))
+        runner.migrate()
+        db.execute_statement("VACUUM")
+        db.insert_value("Users", Username="david", Password="pass#1", Score=0)
+        self.assertEqual(db.select_value("Users", "1 ORDER BY Id", False, "Id", "Username"),
+                         [(2, "bobby"), (3, "carol"), (4, "david")])
+        db.close()
+
+    def test_failed_migration_is_rolled_back(self):
+        db = SQLManager(self.path)
+        runner = MigrationRunner(db)
+        runner.migrate(1)
+        with self.assertRaises(sqlite3.OperationalError):
+            runner.apply(2, ["CREATE INDEX Users_Score ON Users (Score)", "SELECT * FROM Missing"])
+        self.assertEqual(runner.version(), 1)
+        self.assertEqual(db.select_value("sqlite_master", "name == ?", True, "name", params=("Users_Score",)),
+                         None)
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
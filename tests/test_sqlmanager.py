@@ -0,0 +1,107 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from Leaderboard import Leaderboard
+from Migrations import MigrationRunner
+from Utils import SQLManager
+
+
+class SQLManagerTest(unittest.TestCase):
+    # every test has a database of its own in a temporary folder.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "Test.db")
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.close()
+        shutil.rmtree(self.directory)
+
+    # makes a manager of a migrated database with a few players.
+    def manager(self, **options):
+        manager = SQLManager(self.path, **options)
+        self.managers.append(manager)
+        MigrationRunner(manager).migrate()
+        manager.insert_many("Users", ["Username", "Password", "Score"],
+                            [("player{}".format(i), "pass#1", 1) for i in range(10)])
+        return manager
+
+    # returns the score of a player.
+    def score(self, manager, username="player0"):
+        return manager.select_value("Users", "Username == ?", True, "Score", params=(username,))[0]
+
+    def test_cache_is_invalidated_by_writes(self):
+        db = self.manager(cache_size=16)
+        self.assertEqual(self.score(db), 1)
+        db.update_value("Users", "Username == ?", ("player0",), Score=2)
+        self.assertEqual(self.score(db), 2)
+        db.update_many("Users", "Username == ?", ["Score"], [(3, "player0")])
+        self.assertEqual(self.score(db), 3)
+
+    def test_cache_is_kept_by_reads(self):
+        db = self.manager(cache_size=16)
+        self.score(db)
+        MigrationRunner(db).version()
+        db.execute_statement_cursor("WITH Scores AS (SELECT Score FROM Users) SELECT MAX(Score) FROM Scores")
+        self.assertEqual(db.cache_stats()["size"], 1)
+
+    def test_cache_is_invalidated_when_a_pooled_transaction_commits(self):
+        db = self.manager(cache_size=16, pooled=True)
+        self.assertEqual(self.score(db), 1)
+        with db.transaction():
+            db.update_value("Users", "Username == ?", ("player0",), Score=500)
+            # another thread reads the old score before the commit, which must not outlive the transaction.
+            reader = threading.Thread(target=self.score, args=(db,))
+            reader.start()
+            reader.join()
+        self.assertEqual(self.score(db), 500)
+
+    def test_pooled_writes_share_commits(self):
+        db = self.manager(pooled=True, profile=True, commit_delay=0.01)
+        commits = db.stats()["commits"]
+
+        def write(player):
+            for i in range(50):
+                db.update_value("Users", "Username == ?", ("player{}".format(player),), Score=i)
+
+        threads = [threading.Thread(target=write, args=(player,)) for player in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([self.score(db, "player{}".format(player)) for player in range(8)], [49] * 8)
+        self.assertLess(db.stats()["commits"] - commits, 8 * 50 / 2)  # writes from many threads share commits.
+
+    def test_failed_pooled_write_does_not_roll_back_others(self):
+        db = self.manager(pooled=True)
+        with self.assertRaises(sqlite3.IntegrityError):
+            db.insert_value("Users", Username="player0", Password="pass#1", Score=0)
+        db.insert_value("Users", Username="newcomer", Password="pass#1", Score=7)
+        self.assertEqual(self.score(db, "newcomer"), 7)
+
+    def test_pooled_cursor_writes_do_not_hold_the_lock(self):
+        db = self.manager(pooled=True)
+        db.execute_statement_cursor("UPDATE Users SET Score = 4 WHERE Username == ?", ("player0",))
+        start = time.perf_counter()
+        db.update_value("Users", "Username == ?", ("player1",), Score=5)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual((self.score(db), self.score(db, "player1")), (4, 5))
+
+    def test_leaderboard_reads_are_profiled(self):
+        db = self.manager(profile=True)
+        board = Leaderboard(db)
+        board.top(5)
+        self.assertEqual(sum(1 for ignored in board.rows(3)), 10)
+        statements = db.stats()["statements"]
+        self.assertEqual(statements[Leaderboard.PAGE_FIRST]["rows"], 5)
+        self.assertEqual(statements[Leaderboard.ROWS]["rows"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()